@@ -6,6 +6,8 @@ from procemon.zine import Zine
 if __name__ == "__main__":
     # Create the dex.
     d = Dex(num_types=12, num_monsters_per_type=9, quiet=False)
+    # Start getting the sprites in the background.
+    d.prefetch_images()
     d.write_json()
     d.create_cards()
     card_back = CardBack.get(region=d.region, symbol=d.region_symbol)
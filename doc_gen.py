@@ -7,12 +7,24 @@ Create API documentation.
 """
 
 if __name__ == "__main__":
-    files = ["card_back.py",
+    files = ["atomic_file.py",
+             "card_back.py",
              "dex.py",
+             "font_cache.py",
+             "glyph_index.py",
+             "http_cache.py",
+             "http_session.py",
+             "lazy_class_variable.py",
+             "markov_cache.py",
              "monster.py",
              "monster_type.py",
              "move.py",
+             "negative_cache.py",
+             "noise_bank.py",
              "rarity.py",
+             "replay.py",
+             "sprite_cache.py",
+             "type_catalog.py",
              "wv.py",
              "zine.py"]
     md = PyMdDoc(input_directory=Path("procemon"), files=files)
@@ -1 +1,6 @@
-from .dex import Dex
+def __getattr__(name: str):
+    # Import `Dex` the first time it is used, so that importing a module such as `procemon.card_back` doesn't import `Dex` and everything that it needs.
+    if name == "Dex":
+        from .dex import Dex
+        return Dex
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
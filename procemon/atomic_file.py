@@ -0,0 +1,52 @@
+import os
+from tempfile import mkstemp
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+class AtomicFile:
+    """
+    Write files so that other threads and processes never read a partial file.
+
+    Each write goes to a new temporary file in the same directory, which is then renamed to the path.
+    The temporary file is unique per write, so threads and processes that write the same path at the same time don't interfere with each other. The last rename wins.
+    """
+
+    @staticmethod
+    @contextmanager
+    def open(path: Path) -> Iterator[BinaryIO]:
+        """
+        Open a temporary file for writing. When the `with` block ends, the temporary file is renamed to the path.
+        If the `with` block raises an exception, the temporary file is deleted and the path isn't changed.
+
+        :param path: The path to the file. If its directory doesn't exist, it will be created.
+
+        :return: The temporary file, opened in binary mode.
+        """
+
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = mkstemp(dir=str(path.parent.resolve()), prefix=f"{path.name}_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            os.replace(temp_path, str(path.resolve()))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def write(path: Path, content: bytes) -> None:
+        """
+        Write bytes to a file.
+
+        :param path: The path to the file. If its directory doesn't exist, it will be created.
+        :param content: The content of the file.
+        """
+
+        with AtomicFile.open(path) as f:
+            f.write(content)
@@ -1,9 +1,10 @@
-from pkg_resources import get_distribution
-from PIL import Image, ImageFont, ImageDraw
+from typing import Dict, Tuple
+from PIL import Image, ImageDraw
 from PIL.PngImagePlugin import PngImageFile
 import numpy as np
-from perlin_numpy.perlin2d import generate_fractal_noise_2d
 from procemon.paths import IMAGES_DIRECTORY, TEXT_FONT, SYMBOL_FONT
+from procemon.font_cache import FontCache
+from procemon.noise_bank import NoiseBank
 
 
 class CardBack:
@@ -11,6 +12,11 @@ class CardBack:
     Create an image of the back of a card.
     """
 
+    """:class_var
+    Cached card back images. Key = (region, symbol, printable). Value = The card back image.
+    """
+    CARD_BACKS: Dict[Tuple[str, str, bool], PngImageFile] = dict()
+
     @staticmethod
     def get(region: str, symbol: str, printable: bool = False) -> PngImageFile:
         """
@@ -21,6 +27,11 @@ class CardBack:
         :return: An image of a card back.
         """
 
+        # Return a copy of the card back if it's already been created.
+        key = (region, symbol, printable)
+        if key in CardBack.CARD_BACKS:
+            return CardBack.CARD_BACKS[key].copy()
+
         # Load the card template.
         card = Image.open(str(IMAGES_DIRECTORY.joinpath("card_back.png").resolve()))
 
@@ -28,24 +39,26 @@ class CardBack:
             light_color: np.array = np.array([92, 99, 140, 255])
             dark_color: np.array = np.array([35, 57, 107, 255])
             # Get some perlin noise.
-            perlin_noise = generate_fractal_noise_2d(shape=(1056, 680), res=(8, 8))
-            pixels = card.load()
-            for y in range(card.size[1]):
-                for x in range(card.size[0]):
-                    if pixels[x, y] == (255, 255, 255, 255):
-                        # Get a color interpolated with perlin noise.
-                        color = (light_color - dark_color) * perlin_noise[y, x] + dark_color
-                        pixels[x, y] = tuple([int(ch) for ch in color])
+            perlin_noise = NoiseBank.get(res=(8, 8))
+            pixels = np.array(card)
+            white = np.all(pixels == 255, axis=2)
+            # Get colors interpolated with perlin noise for each white pixel.
+            noise = perlin_noise[:pixels.shape[0], :pixels.shape[1]][white]
+            colors = (light_color - dark_color) * noise[:, np.newaxis] + dark_color
+            pixels[white] = np.clip(np.trunc(colors), 0, 255).astype(np.uint8)
+            card = Image.fromarray(pixels, mode="RGBA")
 
         font_color = "black" if printable else "white"
         # Add Subaltern Games text.
-        font = ImageFont.truetype(str(TEXT_FONT.resolve()), 12)
+        font = FontCache.get(TEXT_FONT, 12)
         draw = ImageDraw.Draw(card)
         pad = 52
         draw.text((pad, card.size[1] - 80), "Copyright 2021 Subaltern Games", font_color, font=font)
         version_y = card.size[1] - 80 + 16
         draw.text((pad, version_y), "https://subalterngames.com", font_color, font=font)
         # Add the version.
+        # Import this here because pkg_resources is slow to import and it's only needed to draw a new card back.
+        from pkg_resources import get_distribution
         version = str(get_distribution("procemon")).split(" ")[1]
         version_x = int(card.size[0] - font.getsize(version)[0] - pad)
         draw.text((version_x, version_y), version, font_color, font=font)
@@ -57,7 +70,7 @@ class CardBack:
         region_y = pad + 4
         draw.text((region_x, region_y), region, font_color, font=font)
         # Draw a cool symbol.
-        symbol_font = ImageFont.truetype(str(SYMBOL_FONT.resolve()), 24)
+        symbol_font = FontCache.get(SYMBOL_FONT, 24)
         symbol_x = region_x - symbol_font.getsize(symbol)[0] - 12
         symbol_y = pad
         draw.text((symbol_x, symbol_y), symbol, font_color, font=symbol_font, encoding="symb")
@@ -68,4 +81,5 @@ class CardBack:
         logo_x = int((card.size[0] / 2) - (logo.size[0] / 2))
         logo_y = int((card.size[1] / 2) - (logo.size[1] * 0.66))
         card.paste(logo, (logo_x, logo_y), mask=logo)
-        return card
+        CardBack.CARD_BACKS[key] = card
+        return card.copy()
@@ -1,24 +1,33 @@
 import io
-from random import shuffle, choice
+from random import shuffle, choice, getrandbits, Random
 from json import loads, dumps
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, FrozenSet, Set
+from time import time
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError
 import re
 import textwrap
 import numpy as np
-from requests import get, head
 from requests.exceptions import ConnectionError, MissingSchema, TooManyRedirects, ChunkedEncodingError, ReadTimeout
-from PIL import Image, ImageFont, ImageDraw, UnidentifiedImageError, ImageOps
+from PIL import Image, ImageDraw, UnidentifiedImageError, ImageOps
 from PIL.PngImagePlugin import PngImageFile
-from fontTools.ttLib import TTFont
-from unidecode import unidecode
 import markovify
-from perlin_numpy.perlin2d import generate_fractal_noise_2d
-from procemon.paths import TYPES_DIRECTORY, IMAGES_DIRECTORY, TEXT_FONT, SYMBOL_FONT, MOVES_DIRECTORY, REGIONS_DIRECTORY
+from procemon.paths import IMAGES_DIRECTORY, TEXT_FONT, SYMBOL_FONT, MOVES_DIRECTORY, REGIONS_DIRECTORY, \
+    CACHE_DIRECTORY
 from procemon.monster_type import MonsterType
 from procemon.monster import Monster
+from procemon.markov_cache import MarkovCache
 from procemon.rarity import Rarity
 from procemon.dex_encoder import DexEncoder
+from procemon.font_cache import FontCache
+from procemon.noise_bank import NoiseBank
+from procemon.http_cache import HttpCache, CacheMissError
+from procemon.negative_cache import NegativeCache
+from procemon.sprite_cache import SpriteCache
+from procemon.glyph_index import GlyphIndex, TranslationTable
+from procemon.lazy_class_variable import LazyClassVariable
+from procemon.type_catalog import TypeCatalog
+from procemon.atomic_file import AtomicFile
 
 
 class Dex:
@@ -28,17 +37,17 @@ class Dex:
     """
 
     """:class_var
-    A numpy array of a color palette.
+    A numpy array of a color palette. This is loaded the first time it is used.
     """
-    PALETTE: np.array = np.load(str(IMAGES_DIRECTORY.joinpath("palette.npy").resolve()))
+    PALETTE: np.array = LazyClassVariable(lambda: np.load(str(IMAGES_DIRECTORY.joinpath("palette.npy").resolve())))
     """:class_var
     The portion of the palette where there are light colors.
     """
-    LIGHT_COLORS: np.array = PALETTE[-1][1:-3]
+    LIGHT_COLORS: np.array = LazyClassVariable(lambda: Dex.PALETTE[-1][1:-3])
     """:class_var
     The portion of the palette where there are darker colors.
     """
-    DARK_COLORS: np.array = PALETTE[-2][1:-3]
+    DARK_COLORS: np.array = LazyClassVariable(lambda: Dex.PALETTE[-2][1:-3])
     """:class_var
     The path to the card template image.
     """
@@ -47,20 +56,71 @@ class Dex:
     The path to the energy icons. 
     """
     ENERGY_DIRECTORY: Path = IMAGES_DIRECTORY.joinpath("energy")
-    with TTFont(TEXT_FONT) as font:
-        """:class_var
-        A list of all Unicode characters supported by the font. Source: https://stackoverflow.com/a/58232763
-        """
-        SUPPORTED_CHARACTERS: List[str] = list(set(chr(y[0]) for x in font["cmap"].tables for y in x.cmap.items()))
     """:class_var
-    Base URL for the Wikipedia API. Source: https://stackoverflow.com/a/41807620
+    All of the Unicode characters supported by the font. This is loaded the first time it is used. See: `GlyphIndex`.
+    """
+    SUPPORTED_CHARACTERS: FrozenSet[str] = LazyClassVariable(lambda: GlyphIndex.get(TEXT_FONT))
+    """:class_var
+    A table for `str.translate()` that converts characters that the font doesn't support. See: `Dex.get_supported_string()`.
+    """
+    SUPPORTED_TABLE: TranslationTable = LazyClassVariable(lambda: TranslationTable(Dex.SUPPORTED_CHARACTERS))
+    """:class_var
+    The URL of the Wikipedia API. This can be set to the URL of a local stand-in server.
+    """
+    WIKIPEDIA_API_URL: str = "https://en.wikipedia.org/w/api.php"
+    """:class_var
+    The maximum number of page titles per Wikipedia API query.
     """
-    WIKIPEDIA_API_URL: str = "https://en.wikipedia.org/w/api.php?action=query&prop=imageinfo&format=json&iiprop=url" \
-                             "&generator=images&titles="
+    WIKIPEDIA_API_MAX_TITLES: int = 50
     """:class_var
     Ignore these image URLs.
     """
     URL_EXCLUDE: List[str] = ["https://upload.wikimedia.org/wikipedia/commons/7/74/Red_Pencil_Icon.png"]
+    """:class_var
+    Nouns that are known not to have any images. The list of nouns that ships with this package is permanent. New nouns are appended to a log file in the cache directory.
+    """
+    NO_IMAGES: NegativeCache = NegativeCache(log_path=CACHE_DIRECTORY.joinpath("negative", "no_images.log"),
+                                             seed_path=IMAGES_DIRECTORY.joinpath("no_images.txt"))
+    """:class_var
+    The width and height of a sprite in pixels. Sprites are stored in this size and enlarged when they are added to a card.
+    """
+    SPRITE_SIZE: int = SpriteCache.SIZE
+    """:class_var
+    The width and height of a sprite on a card in pixels.
+    """
+    SPRITE_CARD_SIZE: int = 400
+    """:class_var
+    Request Wikimedia thumbnails of images at this width instead of the full-resolution images.
+    """
+    THUMBNAIL_WIDTH: int = 250
+    """:class_var
+    Don't download images that are larger than this many bytes.
+    """
+    MAX_IMAGE_BYTES: int = 4 * 1024 ** 2
+    """:class_var
+    If possible, decode images at a reduced scale such that they're at least this many pixels wide and tall.
+    """
+    IMAGE_DECODE_SIZE: int = 128
+    """:class_var
+    The card template image. This is loaded the first time it is used. See: `Dex.get_card_template()`.
+    """
+    CARD_TEMPLATE: Optional[PngImageFile] = None
+    """:class_var
+    The number of pre-tinted card background variants per type color. See: `Dex.get_background()`.
+    """
+    NUM_BACKGROUND_VARIANTS: int = 4
+    # The dex that this process renders cards for. This is set only in worker processes. See: `create_cards()`.
+    _WORKER_DEX: Optional["Dex"] = None
+    """:class_var
+    The path to the compiled Markov chain model of region names. See: `Dex.get_region_model()`.
+    """
+    REGION_MODEL_PATH: Path = CACHE_DIRECTORY.joinpath("regions", "region_model.json")
+    """:class_var
+    The number of US county names in the region model relative to the number of Japanese placenames.
+    """
+    NUM_US_REGIONS: int = 100
+    # The compiled region model. This is loaded the first time it is used.
+    _REGION_MODEL: Optional[markovify.Text] = None
 
     def __init__(self, num_types: int = 12, num_monsters_per_type: int = 9, quiet: bool = False):
         """
@@ -69,11 +129,10 @@ class Dex:
         :param quiet: If True, suppress console messages.
         """
 
-        # Get all of the types.
-        all_types = Dex.get_all_types()
-        # Get a random subset of the types.
-        shuffle(all_types)
-        all_types = all_types[:num_types]
+        # Get a random subset of the types. Only the selected types are read from the catalog.
+        type_names = TypeCatalog.get_names()
+        shuffle(type_names)
+        all_types = [TypeCatalog.get(t) for t in type_names[:num_types]]
         """:field
         A dictionary of monster types in this dex. Key = the name of the type. Value = a `MonsterType` object.
         """
@@ -93,13 +152,36 @@ class Dex:
             # If there are more monster types than colors, go back to the start of the color index list.
             if color_index >= len(color_indices):
                 color_index = 0
+        """:field
+        Energy icons colorized and resized for each move cost and type color. Key = (cost, color index). Value = The icon.
+        """
+        self.energy_icons: Dict[Tuple[int, int], PngImageFile] = Dex.get_energy_icons(
+            color_indices=list(self.color_indices.values()))
+        """:field
+        Pre-tinted card backgrounds. Key = (color index, variant). Value = The background image.
+        This is populated as-needed i.e. whenever a card needs a new background. See: `get_background()`.
+        """
+        self.backgrounds: Dict[Tuple[int, int], PngImageFile] = dict()
+        # The random seed used to generate the noise of the card backgrounds.
+        self.__background_seed: int = int(np.random.randint(0, 2 ** 31))
         attack_verbs = MOVES_DIRECTORY.joinpath("attack_verbs.txt").read_text(encoding="utf-8").split("\n")
         shuffle(attack_verbs)
 
+        # Get a region name that doesn't have an output directory yet.
+        # Create the directory immediately so that another process can't use the same name.
+        for i in range(100):
+            region = Dex.get_region()
+            try:
+                Path(f"dst/dex/{region}").mkdir(parents=True)
+                break
+            except FileExistsError:
+                continue
+        else:
+            raise Exception("Failed to generate a region name that doesn't already have an output directory.")
         """:field
         The name of the region of the dex.
         """
-        self.region: str = Dex.get_region()
+        self.region: str = region
         """:field
         A random dingbat for the region.
         """
@@ -109,8 +191,6 @@ class Dex:
         The output directory of the dex.
         """
         self.dst: Path = Path(f"dst/dex/{self.region}")
-        if not self.dst.exists():
-            self.dst.mkdir(parents=True)
         if not quiet:
             print(f"Output directory: {self.dst.resolve()}")
 
@@ -150,16 +230,55 @@ class Dex:
                 rarities.append(Rarity.common)
             for rarity in rarities:
                 m = Monster(primary_type=self.types[t], all_types=all_types, rarity=rarity,
-                            attack_verbs=attack_verbs, type_adjectives=type_adjectives, type_verbs=type_verbs)
+                            attack_verbs=attack_verbs, type_adjectives=type_adjectives, type_verbs=type_verbs,
+                            describe=False)
                 if not quiet:
                     print("\t" + m.name)
                 self.monsters[t][m.name] = m
+        self.describe_monsters(quiet=quiet)
 
         """:field
-        A dictionary of images per monster type. Key = The monster type. Value = The images.
+        A dictionary of sprites per monster type. Key = The monster type. Value = The sprites as grayscale numpy arrays. See: `Dex.get_sprite_image()`.
         This is populated as-needed i.e. whenever we need images for a new type.
         """
-        self.images_per_type: Dict[str, List[PngImageFile]] = dict()
+        self.images_per_type: Dict[str, List[np.ndarray]] = dict()
+        # Sprites that are being fetched in the background. Key = The monster type. Value = A future that returns the sprites. See: `prefetch_images()`.
+        self.__image_futures: Dict[str, Future] = dict()
+
+    def describe_monsters(self, quiet: bool = False) -> int:
+        """
+        Generate the descriptions of every monster that doesn't have one.
+        There is one Markov chain model per type, built from the type's Wikipedia page and shared by every monster with that type, and one small model per monster, built from the Wikipedia pages of its words. See: `Monster.describe()`.
+        Descriptions are unique across the dex.
+
+        :param quiet: If True, suppress console messages.
+
+        :return: The total number of attempts to generate a description.
+        """
+
+        descriptions = set()
+        # Key = (primary type, secondary type). Value = The monsters with those types that need descriptions.
+        pairs: Dict[Tuple[str, str], List[Monster]] = dict()
+        for t in self.monsters:
+            for m in self.monsters[t].values():
+                if m.description is not None:
+                    descriptions.add(m.description)
+                else:
+                    if m.types not in pairs:
+                        pairs[m.types] = list()
+                    pairs[m.types].append(m)
+        num_monsters = 0
+        num_attempts = 0
+        misses = MarkovCache.MISSES
+        for pair in pairs:
+            # The models of the type pages are cached, so they're shared between pairs.
+            pages = [self.types[pair[0]].wikipedia, self.types[pair[1]].wikipedia]
+            num_attempts += Monster.describe(monsters=pairs[pair], pages=pages, descriptions=descriptions, quiet=quiet)
+            num_monsters += len(pairs[pair])
+        if not quiet:
+            print(f"Generated {num_monsters} descriptions from {MarkovCache.MISSES - misses} new models in "
+                  f"{num_attempts} attempts.")
+        return num_attempts
 
     def write_json(self) -> None:
         """
@@ -177,28 +296,123 @@ class Dex:
         self.dst.joinpath("dex.json").write_text(dumps(data, sort_keys=True, indent=2, cls=DexEncoder),
                                                  encoding="utf-8")
 
-    def create_cards(self, quiet: bool = False) -> None:
+    def create_cards(self, quiet: bool = False, workers: int = 1, seed: Optional[int] = None) -> None:
         """
         Create images of each monster in the dex.
+        Before any cards are rendered, this waits for the sprites of every monster type. If a type doesn't have a sprite for each of its monsters, this raises an exception. See: `prefetch_images()`.
 
         :param quiet: If True, suppress console output.
+        :param workers: The number of processes that will render and save cards. If 1, cards are rendered in this process.
+        :param seed: If not None, the random seed. Given the same seed, the cards will be the same regardless of the number of workers.
         """
 
+        # Wait for the sprites of every type. Fail before rendering any cards if a type doesn't have enough sprites.
+        self.prefetch_images()
+        too_few: List[str] = list()
+        for t in self.monsters:
+            self.__wait_for_images(monster_type=t)
+            if len(self.images_per_type[t]) < len(self.monsters[t]):
+                too_few.append(f"{t} ({len(self.images_per_type[t])}/{len(self.monsters[t])})")
+        if len(too_few) > 0:
+            raise Exception(f"Not enough images for monster types: {', '.join(too_few)}")
+
         if not quiet:
             print("Creating cards...")
 
+        # Assign an image to each card in this process so that the images don't depend on the number of workers.
+        jobs: List[Tuple[Monster, np.ndarray, str, Optional[int]]] = list()
         for t in self.monsters:
-            if not quiet:
-                print(t)
             for m in self.monsters[t]:
-                # Generate the card.
-                card = self.get_card(monster=self.monsters[t][m])
-                # Save the card.
-                card.save(str(self.dst.joinpath(f"{self.monsters[t][m].name}.png").resolve()))
-                print(f"\t{m}")
-        print("DONE!")
+                monster = self.monsters[t][m]
+                card_seed = None if seed is None else seed + len(jobs)
+                jobs.append((monster, self.get_image(monster_type=monster.types[0]),
+                             str(self.dst.joinpath(f"{monster.name}.png").resolve()), card_seed))
+
+        # Generate the noise bank before any workers try to load it.
+        NoiseBank.get_fields(res=(4, 4))
+        # Rendering cards in this process with a seed would change this process's random state, but rendering them in workers wouldn't.
+        random_state = np.random.get_state()
+        if workers <= 1:
+            Dex._WORKER_DEX = self
+            monsters = map(Dex._create_card, jobs)
+        else:
+            # Import this here because it imports multiprocessing, which only parallel rendering needs.
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=Dex._init_worker, initargs=(self,))
+            monsters = executor.map(Dex._create_card, jobs)
+        try:
+            t = None
+            for monster in monsters:
+                if monster.types[0] != t:
+                    t = monster.types[0]
+                    if not quiet:
+                        print(t)
+                # Rendering the card can change the monster's description and moves.
+                self.monsters[t][monster.name] = monster
+                if not quiet:
+                    print(f"\t{monster.name}")
+        finally:
+            if workers <= 1:
+                Dex._WORKER_DEX = None
+                if seed is not None:
+                    np.random.set_state(random_state)
+            else:
+                executor.shutdown()
+        if not quiet:
+            print("DONE!")
 
-    def get_image(self, monster_type: str) -> PngImageFile:
+    @staticmethod
+    def _init_worker(dex: "Dex") -> None:
+        """
+        Initialize a card-rendering worker process. Load the card template, noise bank, and fonts once per worker.
+
+        :param dex: The dex.
+        """
+
+        Dex._WORKER_DEX = dex
+        # Don't reuse the parent process's random state.
+        np.random.seed()
+        Dex.get_card_template()
+        NoiseBank.get_fields(res=(4, 4))
+        for size in [18, 22, 24, 28]:
+            FontCache.get(TEXT_FONT, size)
+
+    @staticmethod
+    def _create_card(job: Tuple[Monster, np.ndarray, str, Optional[int]]) -> Monster:
+        """
+        Render and save a card.
+
+        :param job: A tuple: The monster, its sprite, the path to the card file, and the random seed (can be None).
+
+        :return: The monster.
+        """
+
+        monster, image, path, seed = job
+        if seed is not None:
+            np.random.seed(seed)
+        card = Dex._WORKER_DEX.get_card(monster=monster, image=image)
+        card.save(path)
+        return monster
+
+    def prefetch_images(self, max_workers: int = 4) -> None:
+        """
+        Start getting sprites for every monster type in the background. This function doesn't wait for the sprites.
+        `get_image()` and `create_cards()` will wait for the sprites if they aren't ready yet.
+
+        :param max_workers: The maximum number of monster types whose sprites are fetched at the same time.
+        """
+
+        types = [t for t in self.monsters if t not in self.images_per_type and t not in self.__image_futures]
+        if len(types) == 0:
+            return
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        for t in types:
+            # Choose the random seeds here so that the sprites don't depend on the order in which the threads run.
+            self.__image_futures[t] = executor.submit(self.get_images, monster_type=t, seed=getrandbits(32))
+        # The threads will exit after they've fetched all of the sprites.
+        executor.shutdown(wait=False)
+
+    def get_image(self, monster_type: str) -> np.ndarray:
         """
         Generate a sprite for a type of monster.
 
@@ -206,112 +420,310 @@ class Dex:
 
         :param monster_type: The type of monster that needs an image.
 
-        :return: A unique (to this dex) sprite-ish image converted from an ImageNet image.
+        :return: A unique (to this dex) sprite converted from a Wikipedia image, as a grayscale numpy array. See: `Dex.get_sprite_image()`.
         """
-        # Get image URLs for the monster's primary type.
-        if monster_type not in self.images_per_type:
-            self.images_per_type[monster_type] = self.get_images(monster_type=monster_type)
-        # Return the last image in the list. There might be duplicates.
-        if len(self.images_per_type[monster_type]) == 1:
-            return self.images_per_type[monster_type][0]
+
+        self.__wait_for_images(monster_type=monster_type)
+        if len(self.images_per_type[monster_type]) == 0:
+            raise Exception(f"No more images for monster type: {monster_type}")
         # Pop the next image to avoid duplicates.
+        return self.images_per_type[monster_type].pop(0)
+
+    def __wait_for_images(self, monster_type: str) -> None:
+        """
+        Make sure that the sprites of a monster type are in `self.images_per_type`.
+        If the sprites are being fetched in the background, wait for them. Otherwise, if they haven't been fetched, fetch them now.
+
+        :param monster_type: The monster type.
+        """
+
+        if monster_type in self.images_per_type:
+            return
+        if monster_type in self.__image_futures:
+            self.images_per_type[monster_type] = self.__image_futures.pop(monster_type).result()
         else:
-            return self.images_per_type[monster_type].pop(0)
+            self.images_per_type[monster_type] = self.get_images(monster_type=monster_type)
 
-    def get_images(self, monster_type: str) -> List[PngImageFile]:
+    def get_images(self, monster_type: str, max_workers: int = 8, deadline: float = 120,
+                   batch_size: int = 50, seed: Optional[int] = None) -> List[np.ndarray]:
         """
+        Get images for a monster type. Wikipedia pages and images are requested concurrently.
+        Per monster, the preferred image is from the Wikipedia page of the monster's word, then from the pages of other nouns of this type, and then from the Wikipedia page of this type.
+
         :param monster_type: The name of the monster type.
+        :param max_workers: The maximum number of concurrent requests.
+        :param deadline: Stop getting images after this many seconds.
+        :param batch_size: The number of Wikipedia pages per image URL query. If 1, each page is queried separately. See: `get_image_urls_batch()`.
+        :param seed: If not None, the random seed used to shuffle the nouns. If None, use the global random state.
 
-        :return: A list of converted images for this type using ImageNet data.
+        :return: A list of sprites for this type using Wikipedia data, as grayscale numpy arrays. See: `Dex.get_sprite_image()`.
         """
 
-        # Get a list of nouns that are known not to have any images.
-        no_images_path = IMAGES_DIRECTORY.joinpath("no_images.txt")
-        no_images = no_images_path.read_text(encoding="utf-8").split("\n")
-
         # Get the words used for each monster in the dex.
         words: List[str] = [m.words[0] for m in self.monsters[monster_type].values()]
 
         # Use these nouns if the noun in the list fails.
         fallback_nouns = self.types[monster_type].nouns[:]
         # Skip any nouns that are known to not have images.
-        fallback_nouns = [n for n in fallback_nouns if n not in no_images]
+        fallback_nouns = [n for n in fallback_nouns if n not in Dex.NO_IMAGES]
         # Randomize the list of nouns.
-        shuffle(fallback_nouns)
-        # A dictionary of images, where the key is the URL.
-        images: Dict[str, PngImageFile] = dict()
-
-        for i in range(len(words)):
-            # Prefer a Wikipedia page with the same name as the word.
-            nouns = [words[i]]
-            # Fallback: Any other noun in the monster type.
-            nouns.extend(fallback_nouns)
-            # Fallback: The general Wikipedia page.
-            nouns.append(self.types[monster_type].wikipedia)
-            got_image = False
-            for n in nouns:
-                if got_image:
+        if seed is None:
+            shuffle(fallback_nouns)
+        else:
+            Random(seed).shuffle(fallback_nouns)
+        # A dictionary of sprites, where the key is the URL.
+        images: Dict[str, np.ndarray] = dict()
+
+        end_time = time() + deadline
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Key = A noun. Value = A future that returns a list of image URLs.
+        noun_urls: Dict[str, Future] = dict()
+        # Key = An image URL. Value = A future that returns a sprite or None.
+        url_sprites: Dict[str, Future] = dict()
+        # Nouns that were added to `Dex.NO_IMAGES` during this call. Their results are the same for every word, so skip them.
+        no_images: Set[str] = set()
+        timed_out = False
+        try:
+            if batch_size > 1:
+                # Query the pages of the words and the type first.
+                first_nouns = list(dict.fromkeys(words + [self.types[monster_type].wikipedia]))
+                for j in range(0, len(first_nouns), batch_size):
+                    future = executor.submit(Dex.get_image_urls_batch, first_nouns[j: j + batch_size])
+                    for noun in first_nouns[j: j + batch_size]:
+                        noun_urls[noun] = future
+            for i in range(len(words)):
+                if timed_out:
                     break
-                # Try to get images from a Wikipedia page. If the page doesn't exist, remember not to try it again.
-                try:
-                    resp = get(f"{Dex.WIKIPEDIA_API_URL}{n}", timeout=20)
-                    if resp.status_code != 200 and resp.status_code != 301:
-                        no_images.append(n)
-                        continue
-                    data = resp.json()
-                except ConnectionError:
-                    no_images.append(n)
-                    continue
-                except ReadTimeout:
-                    no_images.append(n)
-                    continue
-                # This page doesn't exist.
-                if "query" not in data:
-                    no_images.append(n)
-                    continue
-                urls: List[str] = list()
-                for page in data["query"]["pages"]:
-                    # Pages with IDs are logos or icons.
-                    if "pageid" in data["query"]["pages"][page]:
+                # Prefer a Wikipedia page with the same name as the word.
+                nouns = [words[i]]
+                # Fallback: Any other noun in the monster type.
+                nouns.extend(fallback_nouns)
+                # Fallback: The general Wikipedia page.
+                nouns.append(self.types[monster_type].wikipedia)
+                got_image = False
+                for j, n in enumerate(nouns):
+                    if got_image or timed_out:
+                        break
+                    if n in no_images:
                         continue
-                    for image_info in data["query"]["pages"][page]["imageinfo"]:
-                        urls.append(image_info["url"])
-                if len(urls) == 0:
-                    no_images.append(n)
-                    continue
-                for url in urls:
-                    # Skip URLs that we've already added.
-                    # Skip svg files because they're usually maps, icons, logos, etc.
-                    # Skip any other known logos.
-                    if url in images or ".svg" in url or url.endswith(".webm") or url in Dex.URL_EXCLUDE:
+                    # Query this noun's page and the next few pages that haven't been queried yet at the same time.
+                    # Only query a new batch when the previous batch is used up.
+                    if batch_size > 1:
+                        if n not in noun_urls:
+                            batch: List[str] = list()
+                            for noun in nouns[j:]:
+                                if len(batch) >= batch_size:
+                                    break
+                                if noun not in noun_urls and noun not in batch:
+                                    batch.append(noun)
+                            future = executor.submit(Dex.get_image_urls_batch, batch)
+                            for noun in batch:
+                                noun_urls[noun] = future
+                    else:
+                        for noun in nouns[j: j + max_workers]:
+                            if noun not in noun_urls:
+                                noun_urls[noun] = executor.submit(Dex.get_image_urls, noun)
+                    try:
+                        result = noun_urls[n].result(timeout=max(0.0, end_time - time()))
+                    except TimeoutError:
+                        timed_out = True
+                        break
+                    # We're offline and this page isn't cached.
+                    except CacheMissError:
                         continue
-                    # Try to convert the image URL into a PIL image.
-                    img = Dex.get_image_from_url(url=url)
-                    if img is None:
+                    if batch_size > 1:
+                        # The query failed. Try again the next time we need images.
+                        if n not in result:
+                            continue
+                        urls: List[str] = result[n]
+                    else:
+                        # The request failed. Don't try it again for a while.
+                        if result is None:
+                            Dex.NO_IMAGES.add(n, transient=True)
+                            no_images.add(n)
+                            continue
+                        urls = result
+                    # If the page doesn't exist or doesn't have images, remember not to try it again.
+                    if len(urls) == 0:
+                        Dex.NO_IMAGES.add(n)
+                        no_images.add(n)
                         continue
-                    # Convert to grayscale.
-                    img = ImageOps.grayscale(img)
-                    # Increase the contrast.
-                    img = ImageOps.autocontrast(img)
-                    # Resize.
-                    img = img.resize((32, 32), Image.LANCZOS)
-                    # Colorize using the palette color for this type.
-                    img = ImageOps.colorize(img, black="black",
-                                            white=Dex.LIGHT_COLORS[self.color_indices[monster_type]])
-                    # Enlarge.
-                    img = img.resize((400, 400), Image.NEAREST)
-                    # Append the image.
-                    images[url] = img
-                    # Got an image for this card.
-                    got_image = True
-                    break
-        # Remember the nouns that don't have images.
-        no_images_path.write_text(("\n".join(list(sorted(set(no_images))))).strip(), encoding="utf-8")
+                    # Skip URLs that we've already added.
+                    urls = [url for url in urls if url not in images]
+                    # Request a few images at the same time. Use the first valid image.
+                    for k in range(0, len(urls), max_workers):
+                        if got_image or timed_out:
+                            break
+                        for url in urls[k: k + max_workers]:
+                            if url not in url_sprites:
+                                url_sprites[url] = executor.submit(Dex.get_sprite_from_url, url)
+                        for url in urls[k: k + max_workers]:
+                            try:
+                                sprite = url_sprites[url].result(timeout=max(0.0, end_time - time()))
+                            except TimeoutError:
+                                timed_out = True
+                                break
+                            if sprite is None:
+                                continue
+                            # Append the sprite. It will be colorized and enlarged when it's added to a card.
+                            images[url] = sprite
+                            # Got an image for this card.
+                            got_image = True
+                            break
+        finally:
+            # Don't wait for requests that we don't need anymore.
+            for future in list(noun_urls.values()) + list(url_sprites.values()):
+                future.cancel()
+            executor.shutdown(wait=False)
         return list(images.values())
 
-    def get_card(self, monster: Monster) -> PngImageFile:
+    @staticmethod
+    def get_image_urls(noun: str) -> Optional[List[str]]:
+        """
+        :param noun: A noun that might be the name of a Wikipedia page.
+
+        :return: The URLs of the images on the noun's Wikipedia page. If the page doesn't exist or has no images, this is an empty list. If the request failed, this is None.
+        """
+
+        try:
+            # Source: https://stackoverflow.com/a/41807620
+            resp = HttpCache.get(Dex.WIKIPEDIA_API_URL, params={"action": "query", "prop": "imageinfo",
+                                                                "format": "json", "iiprop": "url",
+                                                                "iiurlwidth": Dex.THUMBNAIL_WIDTH,
+                                                                "generator": "images", "titles": noun}, timeout=20)
+            if resp.status_code != 200 and resp.status_code != 301:
+                return None
+            data = resp.json()
+        # We're offline and this page isn't cached. Don't remember it as a page without images.
+        except CacheMissError:
+            raise
+        except (ConnectionError, ReadTimeout):
+            return None
+        # This page doesn't exist.
+        if "query" not in data:
+            return []
+        urls: List[str] = list()
+        for page in data["query"]["pages"]:
+            # Pages with IDs are logos or icons.
+            if "pageid" in data["query"]["pages"][page]:
+                continue
+            for image_info in data["query"]["pages"][page]["imageinfo"]:
+                url = Dex.get_image_info_url(image_info)
+                if url is not None:
+                    urls.append(url)
+        return urls
+
+    @staticmethod
+    def get_image_info_url(image_info: dict) -> Optional[str]:
+        """
+        :param image_info: Image info from the Wikipedia API.
+
+        :return: The URL of the image's thumbnail if there is one, or the URL of the image. Returns None if we don't want this image.
+        """
+
+        url = image_info["url"]
+        # Skip svg files because they're usually maps, icons, logos, etc.
+        # Skip videos.
+        # Skip any other known logos.
+        if ".svg" in url or url.endswith(".webm") or url in Dex.URL_EXCLUDE:
+            return None
+        return image_info["thumburl"] if "thumburl" in image_info else url
+
+    @staticmethod
+    def get_image_urls_batch(nouns: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the image URLs of many Wikipedia pages. This queries `Dex.WIKIPEDIA_API_MAX_TITLES` pages per request.
+
+        :param nouns: Nouns that might be the names of Wikipedia pages.
+
+        :return: A dictionary. Key = A noun. Value = The URLs of the images on the noun's Wikipedia page. If the page doesn't exist or has no images, this is an empty list. If the query failed, the noun isn't in the dictionary.
+        """
+
+        urls: Dict[str, List[str]] = dict()
+        for i in range(0, len(nouns), Dex.WIKIPEDIA_API_MAX_TITLES):
+            batch = nouns[i: i + Dex.WIKIPEDIA_API_MAX_TITLES]
+            titles = "|".join(batch)
+            # Get the names of the image files on each page.
+            pages = Dex.query_wikipedia_api(params={"prop": "images", "imlimit": "max", "titles": titles})
+            if pages is None:
+                continue
+            # Get the URLs of the image files on all of the pages.
+            files = Dex.query_wikipedia_api(params={"prop": "imageinfo", "iiprop": "url",
+                                                    "iiurlwidth": Dex.THUMBNAIL_WIDTH, "generator": "images",
+                                                    "gimlimit": "max", "titles": titles})
+            if files is None:
+                continue
+            file_urls: Dict[str, List[str]] = dict()
+            for file in files["pages"].values():
+                # Pages with IDs are logos or icons.
+                if "pageid" in file or "imageinfo" not in file:
+                    continue
+                file_urls[file["title"]] = list()
+                for image_info in file["imageinfo"]:
+                    url = Dex.get_image_info_url(image_info)
+                    if url is not None:
+                        file_urls[file["title"]].append(url)
+            # The API might change the titles, for example by capitalizing them.
+            normalized: Dict[str, str] = {n["from"]: n["to"] for n in pages["normalized"]}
+            page_files: Dict[str, List[str]] = dict()
+            for page in pages["pages"].values():
+                if "images" in page:
+                    page_files[page["title"]] = [image["title"] for image in page["images"]]
+            for noun in batch:
+                urls[noun] = list()
+                title = normalized[noun] if noun in normalized else noun
+                if title not in page_files:
+                    continue
+                for file in page_files[title]:
+                    if file in file_urls:
+                        urls[noun].extend(file_urls[file])
+        return urls
+
+    @staticmethod
+    def query_wikipedia_api(params: dict) -> Optional[dict]:
+        """
+        Send a query to the Wikipedia API. If the results are split across multiple responses, get all of them.
+
+        :param params: The query parameters.
+
+        :return: A dictionary: `{"pages": pages, "normalized": normalized titles}`. Returns None if the query failed.
+        """
+
+        params = {"action": "query", "format": "json", **params}
+        result = {"pages": dict(), "normalized": list()}
+        while True:
+            try:
+                resp = HttpCache.get(Dex.WIKIPEDIA_API_URL, params=params, timeout=20)
+                if resp.status_code != 200:
+                    return None
+                data = resp.json()
+            except ConnectionError:
+                return None
+            except ReadTimeout:
+                return None
+            except ValueError:
+                return None
+            if "query" in data:
+                if "normalized" in data["query"]:
+                    result["normalized"].extend(data["query"]["normalized"])
+                if "pages" in data["query"]:
+                    for k, page in data["query"]["pages"].items():
+                        # Merge partial results for the same page.
+                        if k in result["pages"]:
+                            for key in ["images", "imageinfo"]:
+                                if key in page:
+                                    result["pages"][k][key] = result["pages"][k].get(key, []) + page[key]
+                        else:
+                            result["pages"][k] = page
+            # Get the next part of the results.
+            if "continue" not in data:
+                return result
+            params = {**params, **data["continue"]}
+
+    def get_card(self, monster: Monster, image: np.ndarray = None) -> PngImageFile:
         """
         :param monster: The monster.
+        :param image: The monster's sprite. If None, get a new sprite with `get_image()`.
 
         :return: A card image for this monster.
         """
@@ -323,27 +735,11 @@ class Dex:
             monster.description = "None"
         monster.description = Dex.get_supported_string(monster.description)
 
-        card = Image.open(str(Dex.CARD_PATH.resolve()))
-
-        # Get Perlin noise.
-        perlin_noise = generate_fractal_noise_2d(shape=(1056, 680), res=(4, 4))
-
         color_index = self.color_indices[monster.types[0]]
-
-        # Set the background color.
-        bg_color = list(Dex.LIGHT_COLORS[color_index])
-        bg_color.append(255)
-        bg_color = Dex.lighten(bg_color, 0.7)
-        pixels = card.load()
-        for y in range(card.size[1]):
-            for x in range(card.size[0]):
-                if pixels[x, y] == (255, 255, 255, 255):
-                    # Add some Perlin noise.
-                    pixels[x, y] = Dex.lighten(bg_color, (perlin_noise[y, x]))
+        card = self.get_background(color_index=color_index)
         pad_x = 52
-        font_file = str(TEXT_FONT.resolve())
         # Add the name of the monster.
-        f_header = ImageFont.truetype(font_file, 28)
+        f_header = FontCache.get(TEXT_FONT, 28)
         draw = ImageDraw.Draw(card)
         black = (0, 0, 0, 255)
         header_y = 52
@@ -354,7 +750,7 @@ class Dex:
         draw.text((hp_text_x, header_y), hp_text, black, font=f_header)
 
         # Add the types.
-        f_type = ImageFont.truetype(font_file, 18)
+        f_type = FontCache.get(TEXT_FONT, 18)
         type_text_y = header_y + 50
         type_text_x = pad_x
         # Add the first type.
@@ -385,7 +781,7 @@ class Dex:
         else:
             rarity = "Common"
             rarity_x = hp_text_x
-        f_rarity = ImageFont.truetype(font_file, 18)
+        f_rarity = FontCache.get(TEXT_FONT, 18)
         draw.text((rarity_x, type_text_y), rarity, black, font=f_rarity)
 
         # Draw a box for the image.
@@ -397,21 +793,17 @@ class Dex:
         draw.rectangle(image_box_shape, fill=None, outline=black, width=4)
 
         # Add the image.
-        image = self.get_image(monster_type=monster.types[0])
-        card.paste(image, (img_box_shape_x + 2, img_box_shape_y + 2))
-
-        # Get the move energy icons.
-        energy_icons = dict()
-        for f in Dex.ENERGY_DIRECTORY.iterdir():
-            if f.is_file() and f.suffix == ".png":
-                energy_icons[int(f.name[0])] = Image.open(str(f.resolve()))
+        if image is None:
+            image = self.get_image(monster_type=monster.types[0])
+        card.paste(Dex.get_sprite_image(sprite=image, color_index=color_index),
+                   (img_box_shape_x + 2, img_box_shape_y + 2))
 
         move_x = pad_x
         move_text_x = img_box_shape_x
         move_y = img_box_shape_y + img_box_shape_d + 22
 
         # Add the strength.
-        f_strength = ImageFont.truetype(font_file, 22)
+        f_strength = FontCache.get(TEXT_FONT, 22)
         strength_text = f"x2 vs. {monster.strong_against.title()}"
         strength = Image.new('RGBA', f_strength.getsize(strength_text))
         strength_color = list(Dex.DARK_COLORS[self.color_indices[monster.strong_against]])
@@ -435,7 +827,7 @@ class Dex:
             desc_width = 32
         # Add the description.
         desc_text_x = move_x
-        f_desc = ImageFont.truetype(font_file, 18)
+        f_desc = FontCache.get(TEXT_FONT, 18)
         desc = f'“{monster.description}”'
         desc_lines = textwrap.wrap(desc, width=desc_width)
         desc_height = 0
@@ -447,22 +839,12 @@ class Dex:
             desc_heights.append(height)
         desc_text_y = card.size[1] - 52 - desc_height
 
-        f_move_special = ImageFont.truetype(font_file, 18)
-        f_move_damage = ImageFont.truetype(font_file, 28)
+        f_move_special = FontCache.get(TEXT_FONT, 18)
+        f_move_damage = FontCache.get(TEXT_FONT, 28)
         last_line = None
         for i, m in enumerate(monster.moves):
             # Add the energy icon.
-            energy_icon = energy_icons[m.cost]
-            # Colorize the energy icon.
-            energy_icon_color = list(Dex.DARK_COLORS[self.color_indices[monster.types[0]]])
-            energy_icon_color.append(255)
-            energy_icon_color = Dex.lighten(energy_icon_color, 0.8)
-            pixels = energy_icon.load()
-            for y in range(energy_icon.size[1]):
-                for x in range(energy_icon.size[0]):
-                    if pixels[x, y] == (255, 255, 255, 255):
-                        pixels[x, y] = energy_icon_color
-            energy_icon = energy_icon.resize((64, 64))
+            energy_icon = self.energy_icons[(m.cost, color_index)]
             energy_icon_y = move_y
             if m.special == "":
                 energy_icon_y += 12
@@ -477,7 +859,7 @@ class Dex:
             d_move_y = 95
             # Get the size of the name of the move.
             f_move_size = 24
-            f_move = ImageFont.truetype(font_file, f_move_size)
+            f_move = FontCache.get(TEXT_FONT, f_move_size)
             move_font_text_size = f_move.getsize(m.name)
 
             # The maximum width of the move text is the card minus the width of the damage text (if any).
@@ -488,7 +870,7 @@ class Dex:
             # Reset it to fit.
             while move_font_text_size[0] > max_move_width:
                 f_move_size -= 2
-                f_move = ImageFont.truetype(font_file, f_move_size)
+                f_move = FontCache.get(TEXT_FONT, f_move_size)
                 move_font_text_size = f_move.getsize(m.name)
 
             # Print the move.
@@ -555,6 +937,83 @@ class Dex:
 
         return card
 
+    def get_background(self, color_index: int) -> PngImageFile:
+        """
+        Get a card background tinted with a type color and Perlin noise.
+        There are `Dex.NUM_BACKGROUND_VARIANTS` backgrounds per type color. Each is generated the first time it is used.
+
+        :param color_index: The index of the type color in the palette.
+
+        :return: A copy of a randomly chosen background for this type color.
+        """
+
+        key = (color_index, np.random.randint(Dex.NUM_BACKGROUND_VARIANTS))
+        if key not in self.backgrounds:
+            # Each variant always gets the same noise, regardless of which cards were already rendered in this process.
+            state = np.random.get_state()
+            np.random.seed(self.__background_seed + color_index * Dex.NUM_BACKGROUND_VARIANTS + key[1])
+            perlin_noise = NoiseBank.get(res=(4, 4))
+            np.random.set_state(state)
+            card = Dex.get_card_template()
+            # Set the background color.
+            bg_color = list(Dex.LIGHT_COLORS[color_index])
+            bg_color.append(255)
+            bg_color = Dex.lighten(bg_color, 0.7)
+            # Add some Perlin noise to each white pixel of the template.
+            pixels = np.array(card)
+            white = np.all(pixels == 255, axis=2)
+            pixels[white] = Dex.lighten_array(bg_color, perlin_noise[:pixels.shape[0], :pixels.shape[1]][white])
+            self.backgrounds[key] = Image.fromarray(pixels, mode="RGBA")
+        return self.backgrounds[key].copy()
+
+    @staticmethod
+    def get_sprite_image(sprite: np.ndarray, color_index: int) -> Image.Image:
+        """
+        :param sprite: A sprite as a grayscale numpy array.
+        :param color_index: The index of the light palette color.
+
+        :return: The sprite, colorized with the palette color and enlarged to the size of the image on a card.
+        """
+
+        img = ImageOps.colorize(Image.fromarray(sprite, mode="L"), black="black",
+                                white=tuple(int(c) for c in Dex.LIGHT_COLORS[color_index]))
+        return img.resize((Dex.SPRITE_CARD_SIZE, Dex.SPRITE_CARD_SIZE), Image.NEAREST)
+
+    @staticmethod
+    def get_card_template() -> PngImageFile:
+        """
+        :return: A copy of the card template image. The image is loaded from disk the first time this is called.
+        """
+
+        if Dex.CARD_TEMPLATE is None:
+            Dex.CARD_TEMPLATE = Image.open(str(Dex.CARD_PATH.resolve()))
+            Dex.CARD_TEMPLATE.load()
+        return Dex.CARD_TEMPLATE.copy()
+
+    @staticmethod
+    def get_energy_icons(color_indices: List[int]) -> Dict[Tuple[int, int], PngImageFile]:
+        """
+        :param color_indices: The indices of type colors in the palette.
+
+        :return: Energy icons colorized and resized for each move cost and type color. Key = (cost, color index). Value = The icon.
+        """
+
+        energy_icons: Dict[Tuple[int, int], PngImageFile] = dict()
+        for f in Dex.ENERGY_DIRECTORY.iterdir():
+            if not f.is_file() or f.suffix != ".png":
+                continue
+            cost = int(f.name[0])
+            pixels = np.array(Image.open(str(f.resolve())).convert("RGBA"))
+            white = np.all(pixels == 255, axis=2)
+            for color_index in set(color_indices):
+                # Colorize the energy icon.
+                energy_icon_color = list(Dex.DARK_COLORS[color_index])
+                energy_icon_color.append(255)
+                colorized = pixels.copy()
+                colorized[white] = Dex.lighten(energy_icon_color, 0.8)
+                energy_icons[(cost, color_index)] = Image.fromarray(colorized, mode="RGBA").resize((64, 64))
+        return energy_icons
+
     @staticmethod
     def lighten(color, percent) -> tuple:
         """
@@ -574,10 +1033,55 @@ class Dex:
         arr = color + vector * percent
         return tuple([int(a) for a in arr])
 
+    @staticmethod
+    def lighten_array(color, percents: np.array) -> np.array:
+        """
+        Lighten a color by many percents at once. This is the same as calling `lighten()` per percent.
+
+        :param color: The color as an array-like.
+        :param percents: A 1D numpy array of percents by which to lighten.
+
+        :return: A numpy array of lightened colors, one row per percent, as uint8 values.
+        """
+
+        color = np.array(color, dtype=np.float64)
+        white = np.array([255, 255, 255, 255], dtype=np.float64)
+        arr = color + (white - color) * percents[:, np.newaxis]
+        # `int()` truncates towards zero.
+        return np.clip(np.trunc(arr), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def get_sprite_from_url(url: str) -> Optional[np.ndarray]:
+        """
+        Get a sprite from an image URL. If the sprite isn't cached, the image is downloaded and converted, and the sprite is cached. See: `SpriteCache`.
+
+        :param url: The image URL.
+
+        :return: If this is a valid image URL, the sprite as a grayscale numpy array. Otherwise, this returns None.
+        """
+
+        sprite = SpriteCache.get(url)
+        if sprite is not None:
+            return sprite
+        img = Dex.get_image_from_url(url)
+        if img is None:
+            return None
+        # Convert to grayscale.
+        img = ImageOps.grayscale(img)
+        # Increase the contrast.
+        img = ImageOps.autocontrast(img)
+        # Resize.
+        img = img.resize((Dex.SPRITE_SIZE, Dex.SPRITE_SIZE), Image.LANCZOS)
+        sprite = np.asarray(img)
+        SpriteCache.add(url, sprite)
+        return sprite
+
     @staticmethod
     def get_image_from_url(url: str) -> Optional[PngImageFile]:
         """
         Get an image from a URL. The URL might be bad so this function will test it to make sure it's a valid image.
+        The image is downloaded with a single request, which stops as soon as the response isn't an image or is larger than `Dex.MAX_IMAGE_BYTES`.
+        If possible, the image is decoded at a reduced scale. See: `Dex.IMAGE_DECODE_SIZE`.
 
         :param url: The image URL.
 
@@ -586,39 +1090,11 @@ class Dex:
 
         # Fix Wikimedia links.
         url = url.replace("http://upload.wikimedia.org/", "https://upload.wikimedia.org/")
-        # Get the headers to quickly determine if this is an ok URL.
+        # Try to get the image.
         try:
             # Set a short timeout because if it takes too long, we don't want the image anyway.
-            image_header_resp = head(url, timeout=2)
-            # Ignore if this is a text website.
-            # Flickr's HEAD headers don't match its GET headers so we'll have to test them again.
-            flickr = re.search(r"(.*)static\.flickr\.com", url)
-            if flickr is None and ("Content-Type" not in image_header_resp.headers or
-                                   "image" not in image_header_resp.headers["Content-Type"]):
-                return None
+            image_resp = HttpCache.get(url, timeout=10, content_type="image", max_bytes=Dex.MAX_IMAGE_BYTES)
         # If we can't connect, assume that the image doesn't exist.
-        except ConnectionError:
-            return None
-        # If it takes too long to get the image, assume that it doesn't exist.
-        except ReadTimeout:
-            return None
-        except MissingSchema:
-            return None
-
-        # Try to get the image.
-        try:
-            image_resp = get(url, timeout=10)
-            # Check the header to see if this is an image before trying to load it with PIL.
-            if "Content-Type" not in image_resp.headers or \
-                    "image" not in image_resp.headers["Content-Type"]:
-                return None
-            else:
-                # Try to load the image.
-                try:
-                    img = Image.open(io.BytesIO(image_resp.content))
-                    return img
-                except UnidentifiedImageError:
-                    return None
         except ConnectionError:
             return None
         except MissingSchema:
@@ -627,8 +1103,27 @@ class Dex:
             return None
         except ChunkedEncodingError:
             return None
+        # If it takes too long to get the image, assume that it doesn't exist.
         except ReadTimeout:
             return None
+        # This isn't an image or it's too big.
+        if image_resp is None or image_resp.status_code != 200:
+            return None
+        # Try to load the image.
+        try:
+            img = Image.open(io.BytesIO(image_resp.content))
+            # Decode JPEGs at a reduced scale.
+            img.draft("RGB", (Dex.IMAGE_DECODE_SIZE, Dex.IMAGE_DECODE_SIZE))
+            # Reduce other large images.
+            factor = min(img.size) // Dex.IMAGE_DECODE_SIZE
+            if factor > 1 and img.mode in ["L", "LA", "RGB", "RGBA"]:
+                img = img.reduce(factor)
+            return img
+        except UnidentifiedImageError:
+            return None
+        # The image data is truncated or corrupt.
+        except OSError:
+            return None
 
     @staticmethod
     def get_supported_string(string: str) -> str:
@@ -638,7 +1133,7 @@ class Dex:
         :return: A converted string in which all characters are supported by the card font.
         """
 
-        return "".join([(c if c in Dex.SUPPORTED_CHARACTERS else unidecode(c)) for c in string])
+        return string.translate(Dex.SUPPORTED_TABLE)
 
     @staticmethod
     def get_all_types() -> List[MonsterType]:
@@ -646,12 +1141,7 @@ class Dex:
         :return: A list of all available `MonsterTypes`.
         """
 
-        all_types: List[MonsterType] = list()
-        for f in TYPES_DIRECTORY.iterdir():
-            if f.is_file() and f.suffix == ".json":
-                td = loads(f.read_text(encoding="utf-8"))
-                all_types.append(MonsterType(**td))
-        return all_types
+        return [TypeCatalog.get(t) for t in TypeCatalog.get_names()]
 
     @staticmethod
     def get_region() -> str:
@@ -659,21 +1149,7 @@ class Dex:
         :return: The name of the region of the dex.
         """
 
-        japan = REGIONS_DIRECTORY.joinpath("japan.txt").read_text(encoding="utf-8").split("\n")
-        # Parse Japanese placenames into syllables and treat those as words.
-        placenames = list()
-        for j in japan:
-            syllables = re.findall(r"([b-df-hj-np-tv-z]+[aeiouyūō]|[aeiouyūō][b-df-hj-np-tv-yz]+|[aeiouūō])",
-                                   Dex.get_supported_string(j.lower()))
-            syllables[0] = syllables[0].title()
-            sentence = (" ".join(syllables) + ".").strip()
-            placenames.append(sentence)
-        # Get a list of US county names for spice. Take only a subset of them. Treat each letter as a word.
-        us = REGIONS_DIRECTORY.joinpath("us.txt").read_text(encoding="utf-8").split("\n")
-        shuffle(us)
-        placenames.extend([(" ".join(list(u)) + ".").strip() for u in us[:100]])
-        # Create a markov model.
-        model = markovify.Text(placenames)
+        model = Dex.get_region_model()
         # Create a "sentence" and convert it to a word.
         try:
             region = model.make_sentence(tries=100, max_words=12).replace(" ", "")[:-1].lower().title()
@@ -687,12 +1163,77 @@ class Dex:
         except AttributeError:
             return "Mystery"
 
+    @staticmethod
+    def get_regions(num: int) -> List[str]:
+        """
+        :param num: The number of region names.
+
+        :return: A list of unique region names.
+        """
+
+        regions: Dict[str, None] = dict()
+        for i in range(num * 100):
+            if len(regions) >= num:
+                break
+            regions[Dex.get_region()] = None
+        if len(regions) < num:
+            raise Exception(f"Failed to generate {num} unique region names. Got: {len(regions)}")
+        return list(regions.keys())
+
+    @staticmethod
+    def get_region_model() -> markovify.Text:
+        """
+        Get a compiled Markov chain model of Japanese placenames, parsed into syllables, and US county names, parsed into letters.
+        The model is built once and saved to `Dex.REGION_MODEL_PATH`. It is built again if the placename files change.
+
+        :return: The region model.
+        """
+
+        if Dex._REGION_MODEL is not None:
+            return Dex._REGION_MODEL
+        sources = [REGIONS_DIRECTORY.joinpath(f) for f in ["japan.txt", "us.txt"]]
+        # The model is stale if the placename files changed.
+        stamp = [[f.name, f.stat().st_size, f.stat().st_mtime] for f in sources]
+        try:
+            data = loads(Dex.REGION_MODEL_PATH.read_text(encoding="utf-8"))
+            if data["sources"] == stamp and data["num_us"] == Dex.NUM_US_REGIONS:
+                Dex._REGION_MODEL = markovify.Text.from_json(data["model"])
+                return Dex._REGION_MODEL
+        # The file doesn't exist or another process is writing it.
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        japan = sources[0].read_text(encoding="utf-8").split("\n")
+        # Parse Japanese placenames into syllables and treat those as words.
+        placenames = list()
+        for j in japan:
+            syllables = re.findall(r"([b-df-hj-np-tv-z]+[aeiouyūō]|[aeiouyūō][b-df-hj-np-tv-yz]+|[aeiouūō])",
+                                   Dex.get_supported_string(j.lower()))
+            syllables[0] = syllables[0].title()
+            sentence = (" ".join(syllables) + ".").strip()
+            placenames.append(sentence)
+        # Get a list of US county names for spice. Treat each letter as a word.
+        us = sources[1].read_text(encoding="utf-8").split("\n")
+        us_names = [(" ".join(list(u)) + ".").strip() for u in us]
+        # Weight the US county names as if there were only a subset of them.
+        model = markovify.combine([markovify.Text(placenames), markovify.Text(us_names)],
+                                  [1, Dex.NUM_US_REGIONS / len(us_names)])
+        model.compile(inplace=True)
+        try:
+            AtomicFile.write(path=Dex.REGION_MODEL_PATH,
+                             content=dumps({"sources": stamp, "num_us": Dex.NUM_US_REGIONS,
+                                            "model": model.to_json()}).encode("utf-8"))
+        # The model can't be saved, for example because the disk is full. The model is still valid.
+        except OSError:
+            pass
+        Dex._REGION_MODEL = model
+        return model
+
     @staticmethod
     def get_region_symbol() -> str:
         """
         :return: A symbol for the region.
         """
 
-        with TTFont(str(SYMBOL_FONT.resolve())) as font:
-            chars = list(set(chr(y[0]) for x in font["cmap"].tables for y in x.cmap.items() if chr(y[0]).isalnum()))
+        # Sort the characters so that the symbol depends only on the random state.
+        chars = sorted(c for c in GlyphIndex.get(SYMBOL_FONT) if c.isalnum())
         return choice(chars)
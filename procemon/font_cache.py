@@ -0,0 +1,50 @@
+from pathlib import Path
+from typing import Dict, Tuple
+from PIL import ImageFont
+
+
+class FontCache:
+    """
+    Fonts shared by everything that renders text, for example cards and card backs.
+    Loading a font parses its file, so each font is loaded only once per (path, size).
+    """
+
+    """:class_var
+    Cached fonts. Key = (The path to the font file, the font size). Value = The font.
+    """
+    FONTS: Dict[Tuple[str, int], ImageFont.FreeTypeFont] = dict()
+    """:class_var
+    The number of times that a requested font was already cached.
+    """
+    HITS: int = 0
+    """:class_var
+    The number of times that a requested font had to be loaded.
+    """
+    MISSES: int = 0
+
+    @staticmethod
+    def get(path: Path, size: int) -> ImageFont.FreeTypeFont:
+        """
+        :param path: The path to the font file.
+        :param size: The font size.
+
+        :return: The font. If the font isn't cached, it will be loaded and cached.
+        """
+
+        key = (str(path.resolve()), size)
+        if key in FontCache.FONTS:
+            FontCache.HITS += 1
+        else:
+            FontCache.MISSES += 1
+            FontCache.FONTS[key] = ImageFont.truetype(key[0], size)
+        return FontCache.FONTS[key]
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Clear the cache and reset the hit and miss counters.
+        """
+
+        FontCache.FONTS.clear()
+        FontCache.HITS = 0
+        FontCache.MISSES = 0
@@ -0,0 +1,95 @@
+from json import loads, dumps
+from threading import Lock
+from pathlib import Path
+from typing import Dict, FrozenSet, Union
+from unidecode import unidecode
+from procemon.paths import CACHE_DIRECTORY
+from procemon.atomic_file import AtomicFile
+
+
+class GlyphIndex:
+    """
+    The Unicode characters supported by each font file.
+
+    Reading a font's character map requires parsing the font file. The characters of each font are saved to a JSON file in the cache directory, so each font file is parsed only once.
+    If a font file changes, its characters are read again.
+    """
+
+    """:class_var
+    The path to the index file.
+    """
+    PATH: Path = CACHE_DIRECTORY.joinpath("glyph_index.json")
+    # Key = The resolved path to the font file. Value = The characters supported by the font.
+    _CHARACTERS: Dict[str, FrozenSet[str]] = dict()
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get(path: Path) -> FrozenSet[str]:
+        """
+        :param path: The path to the font file.
+
+        :return: All of the Unicode characters supported by the font. Source: https://stackoverflow.com/a/58232763
+        """
+
+        key = str(path.resolve())
+        with GlyphIndex._LOCK:
+            if key in GlyphIndex._CHARACTERS:
+                return GlyphIndex._CHARACTERS[key]
+            stat = path.stat()
+            stamp = [stat.st_size, stat.st_mtime]
+            try:
+                index = loads(GlyphIndex.PATH.read_text(encoding="utf-8"))
+            # The file doesn't exist or another process is writing it.
+            except (FileNotFoundError, ValueError):
+                index = dict()
+            # The font file hasn't changed since it was indexed.
+            if key in index and index[key]["stamp"] == stamp:
+                characters = frozenset(chr(c) for c in index[key]["characters"])
+            else:
+                # Import this here because only a font that hasn't been indexed needs to be parsed.
+                from fontTools.ttLib import TTFont
+                with TTFont(key) as font:
+                    codepoints = sorted(set(y[0] for x in font["cmap"].tables for y in x.cmap.items()))
+                characters = frozenset(chr(c) for c in codepoints)
+                index[key] = {"stamp": stamp, "characters": codepoints}
+                try:
+                    AtomicFile.write(path=GlyphIndex.PATH, content=dumps(index).encode("utf-8"))
+                # The index can't be saved, for example because the disk is full. The characters are still valid.
+                except OSError:
+                    pass
+            GlyphIndex._CHARACTERS[key] = characters
+            return characters
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Forget the characters that have been read. This doesn't delete the index file.
+        """
+
+        with GlyphIndex._LOCK:
+            GlyphIndex._CHARACTERS.clear()
+
+
+class TranslationTable(dict):
+    """
+    A table for `str.translate()` that converts characters that a font doesn't support.
+
+    Supported characters are unchanged. Other characters are converted with unidecode. Each character is converted only once and then cached in the table.
+    """
+
+    def __init__(self, characters: FrozenSet[str]):
+        """
+        :param characters: The characters supported by the font.
+        """
+
+        super().__init__()
+        """:field
+        The characters supported by the font.
+        """
+        self.characters: FrozenSet[str] = characters
+
+    def __missing__(self, key: int) -> Union[int, str]:
+        c = chr(key)
+        value = key if c in self.characters else unidecode(c)
+        self[key] = value
+        return value
@@ -0,0 +1,255 @@
+import os
+from time import time
+from json import loads, dumps
+from hashlib import sha256
+from threading import Lock
+from pathlib import Path
+from typing import Dict, Optional
+from requests import Request
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from procemon.paths import CACHE_DIRECTORY
+from procemon.http_session import HttpSession
+from procemon.atomic_file import AtomicFile
+
+
+class CacheMissError(ConnectionError):
+    """
+    Raised when `HttpCache.OFFLINE` is True and a URL isn't cached.
+    """
+
+    pass
+
+
+class CachedResponse:
+    """
+    The response to an HTTP GET request. This might have been loaded from the cache.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        """
+        :param url: The URL, including query parameters.
+        :param status_code: The HTTP status code.
+        :param headers: The response headers.
+        :param content: The body of the response.
+        """
+
+        """:field
+        The URL, including query parameters.
+        """
+        self.url: str = url
+        """:field
+        The HTTP status code.
+        """
+        self.status_code: int = status_code
+        """:field
+        The response headers.
+        """
+        self.headers: Dict[str, str] = CaseInsensitiveDict(headers)
+        """:field
+        The body of the response.
+        """
+        self.content: bytes = content
+
+    def json(self):
+        """
+        :return: The body of the response, decoded as JSON.
+        """
+
+        return loads(self.content.decode("utf-8"))
+
+
+class HttpCache:
+    """
+    An on-disk cache of HTTP GET responses, shared by every process that generates a dex.
+    Each response is stored in a file named after the hash of its URL.
+    The least recently used files are deleted when the cache is too big.
+    Only successful responses are cached.
+    """
+
+    """:class_var
+    The directory of the cache files.
+    """
+    DIRECTORY: Path = CACHE_DIRECTORY.joinpath("http")
+    """:class_var
+    The maximum size of the cache in bytes.
+    """
+    MAX_SIZE: int = 2 * 1024 ** 3
+    """:class_var
+    Cached responses older than this many seconds are requested again.
+    """
+    TTL: float = 60 * 60 * 24 * 30
+    """:class_var
+    If True, never send requests. Only use cached responses.
+    """
+    OFFLINE: bool = False
+    # The approximate size of the cache in bytes. This is calculated the first time that a response is cached.
+    _SIZE: Optional[int] = None
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get(url: str, params: dict = None, timeout: float = 20, ttl: float = None, content_type: str = None,
+            max_bytes: int = None) -> Optional[CachedResponse]:
+        """
+        Send an HTTP GET request unless the response is already cached.
+        The response is streamed, so that it can be rejected as soon as its headers or size are wrong.
+
+        :param url: The URL.
+        :param params: Query parameters, if any.
+        :param timeout: The request timeout in seconds.
+        :param ttl: If the cached response is older than this many seconds, request it again. If None, use `HttpCache.TTL`.
+        :param content_type: If not None, the Content-Type header must include this string, for example `"image"`.
+        :param max_bytes: If not None, the maximum size of the response body.
+
+        :return: The response. Returns None if the response was rejected because of `content_type` or `max_bytes`.
+        """
+
+        url = HttpCache.get_url(url=url, params=params)
+        resp = HttpCache.load(url=url, ttl=ttl)
+        if resp is not None:
+            if not HttpCache.__is_content_type(resp.headers, content_type) or \
+                    (max_bytes is not None and len(resp.content) > max_bytes):
+                return None
+            return resp
+        if HttpCache.OFFLINE:
+            raise CacheMissError(f"Not cached: {url}")
+        r = HttpSession.get(url, timeout=timeout, stream=True)
+        try:
+            if r.status_code == 200:
+                if not HttpCache.__is_content_type(r.headers, content_type):
+                    return None
+                if max_bytes is not None and int(r.headers.get("Content-Length", 0)) > max_bytes:
+                    return None
+            content = bytearray()
+            for chunk in r.iter_content(chunk_size=64 * 1024):
+                content.extend(chunk)
+                # Stop downloading.
+                if max_bytes is not None and len(content) > max_bytes:
+                    return None
+        finally:
+            r.close()
+        resp = CachedResponse(url=url, status_code=r.status_code, headers=dict(r.headers), content=bytes(content))
+        if resp.status_code == 200:
+            HttpCache.save(resp)
+        return resp
+
+    @staticmethod
+    def load(url: str, params: dict = None, ttl: float = None) -> Optional[CachedResponse]:
+        """
+        Load a cached response.
+
+        :param url: The URL.
+        :param params: Query parameters, if any.
+        :param ttl: If the cached response is older than this many seconds, ignore it. If None, use `HttpCache.TTL`. This is ignored if `HttpCache.OFFLINE` is True.
+
+        :return: The cached response, or None if there isn't one.
+        """
+
+        url = HttpCache.get_url(url=url, params=params)
+        path = HttpCache.get_path(url)
+        try:
+            metadata = loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+            if not HttpCache.OFFLINE and time() - metadata["time"] > (HttpCache.TTL if ttl is None else ttl):
+                return None
+            content = path.read_bytes()
+            # Mark this file as recently used.
+            os.utime(str(path.resolve()))
+        # The file doesn't exist, or was deleted by another process.
+        except (FileNotFoundError, ValueError):
+            return None
+        return CachedResponse(url=url, status_code=200, headers=metadata["headers"], content=content)
+
+    @staticmethod
+    def save(resp: CachedResponse) -> None:
+        """
+        Cache a response. If the cache is too big, delete the least recently used responses.
+
+        :param resp: The response.
+        """
+
+        path = HttpCache.get_path(resp.url)
+        headers = {k: v for k, v in resp.headers.items() if k.lower() == "content-type"}
+        # The size of the response that this response replaces, if any.
+        try:
+            old_size = path.stat().st_size
+        except FileNotFoundError:
+            old_size = 0
+        try:
+            if not path.parent.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+            # The metadata is written last because `load()` reads it first.
+            AtomicFile.write(path=path, content=resp.content)
+            AtomicFile.write(path=path.with_suffix(".json"),
+                             content=dumps({"url": resp.url, "time": time(), "headers": headers}).encode("utf-8"))
+        # The response can't be cached, for example because the disk is full. The response is still valid.
+        except OSError:
+            return
+        with HttpCache._LOCK:
+            if HttpCache._SIZE is None:
+                HttpCache._SIZE = sum(f.stat().st_size for f in HttpCache.DIRECTORY.glob("*/*.bin"))
+            else:
+                HttpCache._SIZE += len(resp.content) - old_size
+            too_big = HttpCache._SIZE > HttpCache.MAX_SIZE
+        if too_big:
+            HttpCache.evict()
+
+    @staticmethod
+    def evict() -> None:
+        """
+        Delete the least recently used responses until the cache is 90% of `HttpCache.MAX_SIZE`.
+        """
+
+        with HttpCache._LOCK:
+            files = list()
+            for f in HttpCache.DIRECTORY.glob("*/*.bin"):
+                try:
+                    stat = f.stat()
+                    files.append((stat.st_mtime, stat.st_size, f))
+                except FileNotFoundError:
+                    continue
+            size = sum(f[1] for f in files)
+            for mtime, file_size, f in sorted(files):
+                if size <= HttpCache.MAX_SIZE * 0.9:
+                    break
+                for p in [f.with_suffix(".json"), f]:
+                    try:
+                        p.unlink()
+                    except FileNotFoundError:
+                        pass
+                size -= file_size
+            HttpCache._SIZE = size
+
+    @staticmethod
+    def __is_content_type(headers: Dict[str, str], content_type: Optional[str]) -> bool:
+        """
+        :param headers: Response headers.
+        :param content_type: A string that the Content-Type header must include. Can be None.
+
+        :return: True if the Content-Type header includes `content_type` or if `content_type` is None.
+        """
+
+        return content_type is None or ("Content-Type" in headers and content_type in headers["Content-Type"])
+
+    @staticmethod
+    def get_url(url: str, params: dict = None) -> str:
+        """
+        :param url: The URL.
+        :param params: Query parameters, if any.
+
+        :return: The URL including the query parameters.
+        """
+
+        if params is None:
+            return url
+        return Request("GET", url, params=params).prepare().url
+
+    @staticmethod
+    def get_path(url: str) -> Path:
+        """
+        :param url: The URL, including query parameters.
+
+        :return: The path to the cached response body. The metadata has the same path with a .json suffix.
+        """
+
+        key = sha256(url.encode("utf-8")).hexdigest()
+        return HttpCache.DIRECTORY.joinpath(key[:2]).joinpath(f"{key}.bin")
@@ -0,0 +1,133 @@
+import os
+from threading import Lock
+from typing import Dict, Optional
+from requests import Session, Response, Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpSession:
+    """
+    A pooled HTTP session shared by everything that sends requests to Wikipedia and Wikimedia.
+    Connections are kept alive and reused, so each request doesn't need a new TCP and TLS handshake.
+    Requests that fail with a 429 or 5xx status code are retried with exponential backoff.
+    """
+
+    """:class_var
+    The maximum number of times that a request is retried.
+    """
+    RETRIES: int = 3
+    """:class_var
+    The backoff factor in seconds. Retries wait for `BACKOFF * 2 ** (retry - 1)` seconds, or for as long as the server's `Retry-After` header says.
+    """
+    BACKOFF: float = 0.5
+    """:class_var
+    Retry requests that fail with these status codes.
+    """
+    RETRY_STATUS_CODES: frozenset = frozenset([429, 500, 502, 503, 504])
+    """:class_var
+    The maximum number of open connections per host. If there are more concurrent requests, they wait for a connection.
+    """
+    MAX_CONNECTIONS_PER_HOST: int = 8
+    """:class_var
+    The User-Agent header. Wikimedia asks that clients identify themselves.
+    """
+    USER_AGENT: str = "procemon (https://github.com/subalterngames/procemon)"
+    """:class_var
+    Send requests to other hosts, for example to a `ReplayServer`. Key = The scheme and host of a URL, for example `"https://en.wikipedia.org"`. Value = The replacement scheme and host.
+    """
+    HOSTS: Dict[str, str] = dict()
+    """:class_var
+    If not None, record every response. The response bodies are downloaded in full, even if they are streamed. See: `Recording`.
+    """
+    RECORDING = None
+    # The session. This is created the first time it is used.
+    _SESSION: Optional[Session] = None
+    # The ID of the process that created the session. Connections can't be shared with forked processes.
+    _PID: Optional[int] = None
+    # Don't create two sessions at the same time.
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get(url: str, **kwargs) -> Response:
+        """
+        Send a GET request.
+
+        :param url: The URL.
+        :param kwargs: Keyword arguments for `requests.Session.get()`, for example `params` and `timeout`.
+
+        :return: The response.
+        """
+
+        resp = HttpSession.get_session().get(HttpSession.get_url(url), **kwargs)
+        HttpSession.__record(method="GET", url=url, params=kwargs.get("params"), resp=resp)
+        return resp
+
+    @staticmethod
+    def head(url: str, **kwargs) -> Response:
+        """
+        Send a HEAD request.
+
+        :param url: The URL.
+        :param kwargs: Keyword arguments for `requests.Session.head()`, for example `timeout`.
+
+        :return: The response.
+        """
+
+        resp = HttpSession.get_session().head(HttpSession.get_url(url), **kwargs)
+        HttpSession.__record(method="HEAD", url=url, params=kwargs.get("params"), resp=resp)
+        return resp
+
+    @staticmethod
+    def get_url(url: str) -> str:
+        """
+        :param url: The URL.
+
+        :return: The URL. If its scheme and host are in `HttpSession.HOSTS`, they are replaced.
+        """
+
+        for host in HttpSession.HOSTS:
+            if url.startswith(host) and (len(url) == len(host) or url[len(host)] in "/?"):
+                return HttpSession.HOSTS[host] + url[len(host):]
+        return url
+
+    @staticmethod
+    def get_session() -> Session:
+        """
+        :return: The session of this process. The session is created the first time this is called.
+        """
+
+        with HttpSession._LOCK:
+            if HttpSession._SESSION is None or HttpSession._PID != os.getpid():
+                # Don't retry read timeouts because the timeouts of image requests are deliberately short.
+                retry = Retry(total=HttpSession.RETRIES, read=0, backoff_factor=HttpSession.BACKOFF,
+                              status_forcelist=HttpSession.RETRY_STATUS_CODES,
+                              allowed_methods=frozenset(["GET", "HEAD"]), respect_retry_after_header=True,
+                              raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=HttpSession.MAX_CONNECTIONS_PER_HOST,
+                                      pool_block=True, max_retries=retry)
+                session = Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"User-Agent": HttpSession.USER_AGENT})
+                HttpSession._SESSION = session
+                HttpSession._PID = os.getpid()
+            return HttpSession._SESSION
+
+    @staticmethod
+    def __record(method: str, url: str, params: Optional[dict], resp: Response) -> None:
+        """
+        If `HttpSession.RECORDING` isn't None, record a response.
+
+        :param method: The request method.
+        :param url: The original URL.
+        :param params: Query parameters, if any.
+        :param resp: The response.
+        """
+
+        if HttpSession.RECORDING is None:
+            return
+        if params is not None:
+            url = Request(method, url, params=params).prepare().url
+        HttpSession.RECORDING.add(method=method, url=url, status_code=resp.status_code, headers=resp.headers,
+                                  content=resp.content)
\ No newline at end of file
@@ -0,0 +1,39 @@
+from threading import Lock
+from typing import Any, Callable, Optional
+
+
+class LazyClassVariable:
+    """
+    A class variable that is loaded the first time that it is used instead of when its module is imported.
+
+    The first time that the variable is used, it is replaced by the loaded value, so it is as fast as any other class variable afterwards.
+    Like any other class variable, it can be set to a different value.
+    """
+
+    def __init__(self, load: Callable[[], Any]):
+        """
+        :param load: A function that loads and returns the value.
+        """
+
+        """:field
+        A function that loads and returns the value.
+        """
+        self.load: Callable[[], Any] = load
+        self.__owner: Optional[type] = None
+        self.__name: str = ""
+        self.__lock: Lock = Lock()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.__owner = owner
+        self.__name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        with self.__lock:
+            # Another thread already loaded the value.
+            value = self.__owner.__dict__[self.__name]
+            if value is not self:
+                return value
+            value = self.load()
+            # Replace this object with the value.
+            setattr(self.__owner, self.__name, value)
+            return value
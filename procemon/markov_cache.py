@@ -0,0 +1,139 @@
+from hashlib import sha256
+from threading import Lock
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+import markovify
+from procemon.paths import CACHE_DIRECTORY
+from procemon.atomic_file import AtomicFile
+
+
+class MarkovCache:
+    """
+    Markov chain models of Wikipedia text, used to generate monster descriptions.
+
+    A model is built once per page of text and saved to disk as JSON, so the text is parsed only once.
+    The models of several pages are combined and compiled once per set of pages, and cached in memory.
+    """
+
+    """:class_var
+    The directory of the per-page model files.
+    """
+    DIRECTORY: Path = CACHE_DIRECTORY.joinpath("markov")
+    """:class_var
+    Compiled models, from least to most recently used. Key = The hashes of the text of each page. Value = The combined and compiled model, or None if none of the pages have any sentences.
+    """
+    MODELS: Dict[FrozenSet[str], Optional[markovify.Text]] = dict()
+    """:class_var
+    The maximum number of compiled models in `MarkovCache.MODELS`. If there are more, the least recently used models are removed.
+    """
+    MAX_MODELS: int = 64
+    """:class_var
+    The number of times that a requested compiled model was already cached.
+    """
+    HITS: int = 0
+    """:class_var
+    The number of times that a requested compiled model had to be combined and compiled.
+    """
+    MISSES: int = 0
+    """:class_var
+    The maximum number of uncompiled per-page models kept in memory. If there are more, the least recently used models are removed. They can be loaded again from disk.
+    """
+    MAX_PAGE_MODELS: int = 128
+    # Uncompiled models per page, from least to most recently used. Key = The hash of the text. Value = The model, or None if the text doesn't have any sentences.
+    _PAGE_MODELS: Dict[str, Optional[markovify.Text]] = dict()
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get(texts: List[str]) -> Optional[markovify.Text]:
+        """
+        :param texts: The text of each Wikipedia page.
+
+        :return: A compiled model of all of the text, or None if none of the text has any sentences. If the model isn't cached, it will be built and cached.
+        """
+
+        keys = [MarkovCache.get_key(text) for text in texts]
+        key = frozenset(keys)
+        with MarkovCache._LOCK:
+            if key in MarkovCache.MODELS:
+                MarkovCache.HITS += 1
+                # Mark this model as the most recently used.
+                compiled = MarkovCache.MODELS.pop(key)
+                MarkovCache.MODELS[key] = compiled
+                return compiled
+            MarkovCache.MISSES += 1
+        models = list()
+        for k, text in dict(zip(keys, texts)).items():
+            model = MarkovCache.get_page_model(text=text, key=k)
+            if model is not None:
+                models.append(model)
+        if len(models) == 0:
+            compiled = None
+        else:
+            compiled = markovify.combine(models).compile(inplace=True)
+        with MarkovCache._LOCK:
+            MarkovCache.MODELS[key] = compiled
+            while len(MarkovCache.MODELS) > MarkovCache.MAX_MODELS:
+                del MarkovCache.MODELS[next(iter(MarkovCache.MODELS))]
+        return compiled
+
+    @staticmethod
+    def get_page_model(text: str, key: str = None) -> Optional[markovify.Text]:
+        """
+        :param text: The text of a Wikipedia page.
+        :param key: The hash of the text. If None, it will be calculated.
+
+        :return: An uncompiled model of the text, or None if the text doesn't have any sentences. The model is loaded from disk if possible. Otherwise, it is built and saved.
+        """
+
+        if key is None:
+            key = MarkovCache.get_key(text)
+        with MarkovCache._LOCK:
+            if key in MarkovCache._PAGE_MODELS:
+                # Mark this model as the most recently used.
+                model = MarkovCache._PAGE_MODELS.pop(key)
+                MarkovCache._PAGE_MODELS[key] = model
+                return model
+        path = MarkovCache.DIRECTORY.joinpath(key[:2]).joinpath(f"{key}.json")
+        model: Optional[markovify.Text] = None
+        try:
+            model = markovify.Text.from_json(path.read_text(encoding="utf-8"))
+        # The file doesn't exist or another process is writing it.
+        except (FileNotFoundError, ValueError):
+            try:
+                model = markovify.Text(text)
+            # The text doesn't have any sentences.
+            except KeyError:
+                model = None
+            if model is not None:
+                try:
+                    AtomicFile.write(path=path, content=model.to_json().encode("utf-8"))
+                # The model can't be saved, for example because the disk is full. The model is still valid.
+                except OSError:
+                    pass
+        with MarkovCache._LOCK:
+            MarkovCache._PAGE_MODELS[key] = model
+            while len(MarkovCache._PAGE_MODELS) > MarkovCache.MAX_PAGE_MODELS:
+                del MarkovCache._PAGE_MODELS[next(iter(MarkovCache._PAGE_MODELS))]
+        return model
+
+    @staticmethod
+    def get_key(text: str) -> str:
+        """
+        :param text: The text of a Wikipedia page.
+
+        :return: The hash of the text.
+        """
+
+        return sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Clear the in-memory caches and reset the hit and miss counters. This doesn't delete the model files.
+        """
+
+        with MarkovCache._LOCK:
+            MarkovCache.MODELS.clear()
+            MarkovCache._PAGE_MODELS.clear()
+            MarkovCache.HITS = 0
+            MarkovCache.MISSES = 0
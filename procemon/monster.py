@@ -1,15 +1,16 @@
-import io
 import re
-from random import choice, randint, shuffle
-from typing import Tuple, List, Dict
-from requests import get, head
+from random import choice, randint, random
+from typing import Tuple, List, Dict, Set, Optional
 from requests.exceptions import ConnectionError, ReadTimeout
-from bs4 import BeautifulSoup
-import markovify
 from procemon.monster_type import MonsterType
 from procemon.move import Move
 from procemon.rarity import Rarity
-from procemon.paths import FLAVOR_TEXT_DIRECTORY, TYPES_DIRECTORY
+from procemon.paths import FLAVOR_TEXT_DIRECTORY, TYPES_DIRECTORY, CACHE_DIRECTORY
+from procemon.http_session import HttpSession
+from procemon.http_cache import HttpCache, CachedResponse
+from procemon.negative_cache import NegativeCache
+from procemon.markov_cache import MarkovCache
+from procemon.lazy_class_variable import LazyClassVariable
 
 
 class Monster:
@@ -22,19 +23,26 @@ class Monster:
     """
     WIKIPEDIA: Dict[str, str] = dict()
     """:class_var
-    The path to the list of bad Wikipedia URLs.
+    The URL of the Wikipedia API. Page text is requested as plain text extracts.
+    """
+    WIKIPEDIA_API_URL: str = "https://en.wikipedia.org/w/api.php"
+    """:class_var
+    The path to the list of known bad Wikipedia URLs that ships with this package. These URLs are always bad.
     """
     BAD_WIKIPEDIA_URLS_PATH = FLAVOR_TEXT_DIRECTORY.joinpath("bad_wikipedia_urls.txt")
     """:class_var
-    A list of known bad Wikipedia URLs.
+    Known bad Wikipedia URLs. New bad URLs are appended to a log file in the cache directory.
     """
-    BAD_WIKIPEDIA_URLS: List[str] = BAD_WIKIPEDIA_URLS_PATH.read_text(encoding="utf-8").split("\n")
+    BAD_WIKIPEDIA_URLS: NegativeCache = NegativeCache(log_path=CACHE_DIRECTORY.joinpath("negative",
+                                                                                        "bad_wikipedia_urls.log"),
+                                                      seed_path=BAD_WIKIPEDIA_URLS_PATH)
     """:class_var
     A list of consonant sequences that appear in English.
     Scraped from here: http://www.ashley-bovan.co.uk/words/partsofspeech.html
+    This is loaded the first time it is used.
     """
-    CONSONANT_SEQUENCES: List[str] = TYPES_DIRECTORY.joinpath("consonant_sequences.txt").read_text(encoding="utf-8").\
-        split("\n")
+    CONSONANT_SEQUENCES: List[str] = LazyClassVariable(lambda: TYPES_DIRECTORY.joinpath("consonant_sequences.txt").
+                                                       read_text(encoding="utf-8").split("\n"))
     """:class_var
     A list of vowels.
     """
@@ -43,9 +51,18 @@ class Monster:
     A list of vowels without Y.
     """
     VOWELS_NOT_Y: List[str] = VOWELS[:-1]
+    """:class_var
+    The maximum number of attempts to generate each description.
+    """
+    DESCRIPTION_ATTEMPTS: int = 21
+    """:class_var
+    The probability that an attempt to generate a description uses the model of the monster's own words instead of a model of one of its types.
+    """
+    WORDS_PROBABILITY: float = 0.25
 
     def __init__(self, primary_type: MonsterType, all_types: List[MonsterType], attack_verbs: List[str],
-                 type_verbs: Dict[str, List[str]], type_adjectives: Dict[str, List[str]], rarity: Rarity):
+                 type_verbs: Dict[str, List[str]], type_adjectives: Dict[str, List[str]], rarity: Rarity,
+                 describe: bool = True):
         """
         :param all_types: All possible monster types in the dex.
         :param primary_type: The primary type of the monster. The monster will have a second type, chosen randomly.
@@ -53,6 +70,7 @@ class Monster:
         :param type_verbs: Verbs per monster type.
         :param attack_verbs: Type-agnostic verbs.
         :param rarity: The rarity of this monster. Determines its overall strength and coolness.
+        :param describe: If True, generate a description. If False, the description is None; use `Monster.describe()` to generate the descriptions of many monsters at once.
         """
 
         types: List[MonsterType] = [primary_type]
@@ -126,37 +144,12 @@ class Monster:
         # Capitalize the name.
         self.name = self.name.title()
 
-        # Get a list of potential wiki words.
-        wikipedia_pages: List[str] = self.words[:]
-        shuffle(wikipedia_pages)
-        for t in types:
-            wikipedia_pages.insert(0, t.wikipedia)
-
-        txt = ""
-        num_pages = 0
-        for w in wikipedia_pages:
-            # Try to get a wikipedia page of the word.
-            wiki_text = Monster.get_wiki_text(page=w)
-            if wiki_text is not None:
-                txt += wiki_text + "\n"
-                num_pages += 1
-            if num_pages >= 4:
-                break
-        try:
-            model = markovify.Text(txt)
-        except KeyError:
-            raise Exception(wikipedia_pages, txt)
         """:field
         A description of the monster.
         """
-        self.description: str = model.make_short_sentence(80)
-        # Make a few attempts.
-        num_attempts = 0
-        while num_attempts < 20 and self.description is None:
-            num_attempts += 1
-            self.description = model.make_short_sentence(80)
-        if self.description is None:
-            print(f"No description: {wikipedia_pages}")
+        self.description: Optional[str] = None
+        if describe:
+            Monster.describe(monsters=[self], pages=[t.wikipedia for t in types])
 
         """:field
         The monster's moves as `Move` objects.
@@ -176,6 +169,53 @@ class Monster:
         else:
             self.hp: int = randint(5, 12)
 
+    @staticmethod
+    def describe(monsters: List["Monster"], pages: List[str], descriptions: Set[str] = None,
+                 quiet: bool = False) -> int:
+        """
+        Generate the descriptions of many monsters that share Wikipedia pages, for example the pages of their types.
+        Each shared page has its own Markov chain model, and each monster has a model of the Wikipedia pages of its words.
+        The models are cached, so the model of a page is compiled once and reused by every monster that shares it.
+        Each attempt to generate a description uses the model of the monster's words with a probability of `Monster.WORDS_PROBABILITY`, and otherwise the model of a random shared page.
+        Each monster gets a description that isn't already in `descriptions`.
+
+        :param monsters: The monsters.
+        :param pages: The names of the shared Wikipedia pages.
+        :param descriptions: Descriptions that are already in use. New descriptions are added to this set. If None, descriptions are unique only among `monsters`.
+        :param quiet: If True, don't print a message when a monster doesn't get a description.
+
+        :return: The total number of attempts to generate a description.
+        """
+
+        if descriptions is None:
+            descriptions = set()
+        # Get a cached model of each shared page.
+        shared_models = list()
+        for p in dict.fromkeys(pages):
+            model = MarkovCache.get(texts=[Monster.get_wiki_text(page=p)])
+            if model is not None:
+                shared_models.append(model)
+        num_attempts = 0
+        for monster in monsters:
+            # Get a cached model of the pages of the monster's words.
+            words_model = MarkovCache.get(texts=[Monster.get_wiki_text(page=w) for w in dict.fromkeys(monster.words)])
+            if words_model is None and len(shared_models) == 0:
+                raise Exception(pages, monster.words)
+            for i in range(Monster.DESCRIPTION_ATTEMPTS):
+                num_attempts += 1
+                if words_model is not None and (len(shared_models) == 0 or random() < Monster.WORDS_PROBABILITY):
+                    model = words_model
+                else:
+                    model = choice(shared_models)
+                description = model.make_short_sentence(80)
+                if description is not None and description not in descriptions:
+                    monster.description = description
+                    descriptions.add(description)
+                    break
+            if monster.description is None and not quiet:
+                print(f"No description: {pages + monster.words}")
+        return num_attempts
+
     @staticmethod
     def get_wiki_text(page: str) -> str:
         """
@@ -193,45 +233,49 @@ class Monster:
         # If this is a known bad page, ignore it.
         if url in Monster.BAD_WIKIPEDIA_URLS:
             return ""
-        # Test the HEAD header to see if the page exists.
+        # The cache stores the paragraph text of the page. Ignore pages that were cached as HTML by older versions.
+        resp = HttpCache.load(url)
+        if resp is not None and "text/plain" in resp.headers.get("Content-Type", ""):
+            wiki = resp.content.decode("utf-8")
+            Monster.WIKIPEDIA[page] = wiki
+            return wiki
+        if HttpCache.OFFLINE:
+            return ""
+        # Get the page as plain text. Source: https://www.mediawiki.org/wiki/Extension:TextExtracts
         try:
-            resp = head(url, timeout=20)
-            if resp.status_code != 200 and resp.status_code != 301:
-                Monster.add_to_bad_urls(url)
+            resp = HttpSession.get(Monster.WIKIPEDIA_API_URL,
+                                   params={"action": "query", "format": "json", "prop": "extracts",
+                                           "explaintext": 1, "redirects": 1, "titles": page}, timeout=20)
+            if resp.status_code != 200:
+                # Server errors are transient.
+                Monster.add_to_bad_urls(url, transient=resp.status_code in HttpSession.RETRY_STATUS_CODES)
                 return ""
-        except ConnectionError:
-            Monster.add_to_bad_urls(url)
+            pages = resp.json().get("query", {}).get("pages", {})
+        # Try again later.
+        except (ConnectionError, ReadTimeout, ValueError):
+            Monster.add_to_bad_urls(url, transient=True)
             return ""
-        except ReadTimeout:
-            Monster.add_to_bad_urls(url)
-            return ""
-
-        resp = get(url)
-        if resp.status_code != 200 and resp.status_code != 301:
+        extracts = [p["extract"] for p in pages.values() if "extract" in p]
+        # The page doesn't exist.
+        if len(extracts) == 0:
             Monster.add_to_bad_urls(url)
             return ""
-        # Scrape all of the paragraphs.
-        soup = BeautifulSoup(resp.content, 'html.parser')
-        paragraphs = soup.select("p")
-        wiki = ""
-        for para in paragraphs:
-            # Ignore lists of words.
-            if max([len(p) for p in para.text.split("\n")]) < 80:
-                continue
-            # Remove footnotes and append the paragraph to the wiki text.
-            wiki += re.sub(r"\[[0-9]{1,3}\]", "", para.text)
+        # Each paragraph is a line. Ignore headings and lists of words.
+        # Remove footnotes.
+        wiki = "\n".join([re.sub(r"\[[0-9]{1,3}\]", "", p) for p in extracts[0].split("\n") if len(p) >= 80])
         # Cache the page.
+        HttpCache.save(CachedResponse(url=url, status_code=200, headers={"Content-Type": "text/plain; charset=utf-8"},
+                                      content=wiki.encode("utf-8")))
         Monster.WIKIPEDIA[page] = wiki
         return wiki
 
     @staticmethod
-    def add_to_bad_urls(url: str) -> None:
+    def add_to_bad_urls(url: str, transient: bool = False) -> None:
         """
         Remember that this a bad Wikipedia URL.
 
         :param url: The bad Wikipedia URL.
+        :param transient: If True, the request failed because of a transient error such as a timeout, and the URL will be tried again later.
         """
 
-        Monster.BAD_WIKIPEDIA_URLS.append(url)
-        with io.open(str(Monster.BAD_WIKIPEDIA_URLS_PATH.resolve()), "at", encoding="utf-8") as f:
-            f.write(url + "\n")
+        Monster.BAD_WIKIPEDIA_URLS.add(url, transient=transient)
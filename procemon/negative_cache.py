@@ -0,0 +1,116 @@
+import os
+from time import time
+from threading import Lock
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class NegativeCache:
+    """
+    A set of keys that are known to be bad, for example Wikipedia pages that don't exist.
+
+    Lookups are dictionary lookups. New entries are appended to a log file, one line per entry, so many threads and processes can add entries at the same time.
+    Each entry has an expiration time so that transient failures, such as timeouts, are tried again later.
+    Entries that other processes append to the log file are read periodically.
+    """
+
+    """:class_var
+    Entries for transient failures expire after this many seconds.
+    """
+    TRANSIENT_TTL: float = 60 * 60 * 24
+    """:class_var
+    Read entries that other processes appended to the log file at most this often, in seconds.
+    """
+    REFRESH_INTERVAL: float = 1
+
+    def __init__(self, log_path: Path, seed_path: Path = None):
+        """
+        :param log_path: The path to the log file. New entries are appended to this file.
+        :param seed_path: If not None, the path to a text file of permanent entries, one per line. This file is never modified.
+        """
+
+        """:field
+        The path to the log file. New entries are appended to this file.
+        """
+        self.log_path: Path = log_path
+        """:field
+        If not None, the path to a text file of permanent entries, one per line. This file is never modified.
+        """
+        self.seed_path: Optional[Path] = seed_path
+        # Key = An entry. Value = The time when the entry expires.
+        self.__entries: Optional[Dict[str, float]] = None
+        # The number of bytes of the log file that have been read.
+        self.__offset: int = 0
+        # The last time that the log file was read.
+        self.__read_time: float = 0
+        self.__lock: Lock = Lock()
+
+    def __contains__(self, key: str) -> bool:
+        """
+        :param key: The key.
+
+        :return: True if the key is a non-expired entry.
+        """
+
+        with self.__lock:
+            if self.__entries is None or time() - self.__read_time > NegativeCache.REFRESH_INTERVAL:
+                self.__read()
+            return key in self.__entries and self.__entries[key] > time()
+
+    def add(self, key: str, transient: bool = False) -> None:
+        """
+        Add an entry. If the key is already an entry that expires at the same time or later, nothing is written. Raises an exception if the key contains a tab or a newline.
+
+        :param key: The key.
+        :param transient: If True, this is a transient failure and the entry expires after `NegativeCache.TRANSIENT_TTL` seconds. If False, the entry never expires.
+        """
+
+        # Entries are stored one per line, and the expiration time is separated from the key by a tab.
+        if "\n" in key or "\t" in key:
+            raise Exception(f"Negative cache keys can't contain tabs or newlines: {repr(key)}")
+        expires = time() + NegativeCache.TRANSIENT_TTL if transient else float("inf")
+        with self.__lock:
+            if self.__entries is None:
+                self.__read()
+            # Don't append a duplicate entry to the log file.
+            if key in self.__entries and self.__entries[key] >= expires:
+                return
+            self.__entries[key] = expires
+            if not self.log_path.parent.exists():
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            # Appending a single short line with a single write is atomic, so processes can't interleave their entries.
+            fd = os.open(str(self.log_path.resolve()), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, f"{expires}\t{key}\n".encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    def __read(self) -> None:
+        """
+        Read the seed file if it hasn't been read yet, and read any new lines in the log file.
+        """
+
+        if self.__entries is None:
+            self.__entries = dict()
+            if self.seed_path is not None and self.seed_path.exists():
+                for line in self.seed_path.read_text(encoding="utf-8").split("\n"):
+                    if line != "":
+                        self.__entries[line] = float("inf")
+        self.__read_time = time()
+        if not self.log_path.exists():
+            return
+        with self.log_path.open("rb") as f:
+            f.seek(self.__offset)
+            data = f.read()
+        # Ignore a line that another process hasn't finished writing yet.
+        end = data.rfind(b"\n") + 1
+        self.__offset += end
+        for line in data[:end].split(b"\n"):
+            if line == b"":
+                continue
+            # Ignore a malformed line, for example one that was damaged by a crash.
+            try:
+                expires, key = line.decode("utf-8").split("\t", 1)
+                self.__entries[key] = float(expires)
+            except ValueError:
+                continue
@@ -0,0 +1,84 @@
+from typing import Dict, Tuple
+import numpy as np
+from procemon.paths import CACHE_DIRECTORY
+from procemon.atomic_file import AtomicFile
+
+
+class NoiseBank:
+    """
+    A fixed set of fractal Perlin noise fields. The fields are generated once, saved to disk, and memory-mapped.
+    Each sample is a randomly chosen field with a random offset and random flips, so that cards still look varied.
+    The fields are tileable, so offsetting them doesn't create seams.
+    """
+
+    """:class_var
+    The shape of each noise field.
+    """
+    SHAPE: Tuple[int, int] = (1056, 680)
+    """:class_var
+    The number of noise fields per resolution.
+    """
+    NUM_FIELDS: int = 8
+    """:class_var
+    The random seed used to generate the noise fields.
+    """
+    SEED: int = 0
+    """:class_var
+    The directory of the noise field files.
+    """
+    DIRECTORY = CACHE_DIRECTORY.joinpath("noise")
+    """:class_var
+    Memory-mapped noise fields. Key = The resolution. Value = A numpy array of shape `(NUM_FIELDS, SHAPE[0], SHAPE[1])`.
+    """
+    FIELDS: Dict[Tuple[int, int], np.array] = dict()
+
+    @staticmethod
+    def get(res: Tuple[int, int]) -> np.array:
+        """
+        Sample a noise field. This uses numpy's global random state, so `np.random.seed()` makes the sample deterministic.
+
+        :param res: The number of periods of noise along each axis. `SHAPE` must be a multiple of `res`.
+
+        :return: A numpy array of noise of shape `SHAPE`.
+        """
+
+        fields = NoiseBank.get_fields(res=res)
+        field = fields[np.random.randint(len(fields))]
+        # Offset the field.
+        field = np.roll(field, (np.random.randint(NoiseBank.SHAPE[0]), np.random.randint(NoiseBank.SHAPE[1])),
+                        axis=(0, 1))
+        # Flip the field. Flipping both axes rotates the field by 180 degrees.
+        if np.random.randint(2) == 1:
+            field = field[::-1, :]
+        if np.random.randint(2) == 1:
+            field = field[:, ::-1]
+        return field
+
+    @staticmethod
+    def get_fields(res: Tuple[int, int]) -> np.array:
+        """
+        Get all of the noise fields at a given resolution. If they don't exist on disk, generate and save them.
+
+        :param res: The number of periods of noise along each axis. `SHAPE` must be a multiple of `res`.
+
+        :return: A memory-mapped numpy array of shape `(NUM_FIELDS, SHAPE[0], SHAPE[1])`.
+        """
+
+        if res in NoiseBank.FIELDS:
+            return NoiseBank.FIELDS[res]
+        path = NoiseBank.DIRECTORY.joinpath(f"{NoiseBank.SHAPE[0]}x{NoiseBank.SHAPE[1]}_{res[0]}x{res[1]}_"
+                                            f"{NoiseBank.NUM_FIELDS}_{NoiseBank.SEED}.npy")
+        if not path.exists():
+            # Import this here because it's only needed the first time that noise fields are generated.
+            from perlin_numpy.perlin2d import generate_fractal_noise_2d
+            # Generate the fields without changing the global random state.
+            state = np.random.get_state()
+            np.random.seed(NoiseBank.SEED)
+            fields = np.zeros((NoiseBank.NUM_FIELDS, NoiseBank.SHAPE[0], NoiseBank.SHAPE[1]), dtype=np.float32)
+            for i in range(NoiseBank.NUM_FIELDS):
+                fields[i] = generate_fractal_noise_2d(shape=NoiseBank.SHAPE, res=res, tileable=(True, True))
+            np.random.set_state(state)
+            with AtomicFile.open(path) as f:
+                np.save(f, fields)
+        NoiseBank.FIELDS[res] = np.load(str(path.resolve()), mmap_mode="r")
+        return NoiseBank.FIELDS[res]
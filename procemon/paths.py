@@ -1,8 +1,7 @@
 from pathlib import Path
-from pkg_resources import resource_filename
 
 # The path to the data files.
-DATA_DIRECTORY = Path(resource_filename(__name__, "data"))
+DATA_DIRECTORY = Path(__file__).resolve().parent.joinpath("data")
 # The path to the types files.
 TYPES_DIRECTORY = DATA_DIRECTORY.joinpath("types")
 # The path to the moves files.
@@ -21,3 +20,5 @@ FLAVOR_TEXT_DIRECTORY = DATA_DIRECTORY.joinpath("flavor_text")
 REGIONS_DIRECTORY = DATA_DIRECTORY.joinpath("regions")
 # The directory of the word vector file.
 WORD_VEC_DIRECTORY = Path.home().joinpath("procemon_wv")
+# The directory of files that are generated and cached at runtime.
+CACHE_DIRECTORY = Path.home().joinpath("procemon_cache")
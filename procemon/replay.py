@@ -0,0 +1,266 @@
+from time import sleep
+from json import loads, dumps
+from random import Random
+from hashlib import sha256
+from threading import Lock, Thread
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from requests import Request
+
+
+class Recording:
+    """
+    HTTP responses recorded in a directory, so that they can be replayed later by a `ReplayServer`.
+    The directory has an index file and a file per response body. Each line of the index file is a JSON dictionary describing a response.
+
+    To record responses, set `HttpSession.RECORDING` to a `Recording`.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        :param directory: The directory of the recording. If it doesn't exist, it will be created when the first response is recorded.
+        """
+
+        """:field
+        The directory of the recording.
+        """
+        self.directory: Path = directory
+        # Key = (method, URL). Value = (status code, headers, the hash of the body).
+        self.__responses: Dict[Tuple[str, str], Tuple[int, Dict[str, str], str]] = dict()
+        self.__lock: Lock = Lock()
+        index_path = self.directory.joinpath("index.jsonl")
+        if index_path.exists():
+            for line in index_path.read_text(encoding="utf-8").split("\n"):
+                if line == "":
+                    continue
+                r = loads(line)
+                self.__responses[(r["method"], r["url"])] = (r["status_code"], r["headers"], r["body"])
+
+    def add(self, method: str, url: str, status_code: int, headers: Dict[str, str], content: bytes) -> None:
+        """
+        Record a response. If there is already a response for this method and URL, it is replaced.
+
+        :param method: The request method, for example `"GET"`.
+        :param url: The URL, including query parameters.
+        :param status_code: The HTTP status code.
+        :param headers: The response headers. Only the Content-Type header is recorded.
+        :param content: The body of the response.
+        """
+
+        url = Recording.get_url(method=method, url=url)
+        headers = {k: v for k, v in headers.items() if k.lower() == "content-type"}
+        body = sha256(content).hexdigest()
+        with self.__lock:
+            body_path = self.directory.joinpath("bodies", f"{body}.bin")
+            if not body_path.exists():
+                if not body_path.parent.exists():
+                    body_path.parent.mkdir(parents=True)
+                body_path.write_bytes(content)
+            self.__responses[(method, url)] = (status_code, headers, body)
+            with self.directory.joinpath("index.jsonl").open("at", encoding="utf-8") as f:
+                f.write(dumps({"method": method, "url": url, "status_code": status_code, "headers": headers,
+                               "body": body}) + "\n")
+
+    def get(self, method: str, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """
+        :param method: The request method, for example `"GET"`.
+        :param url: The URL, including query parameters.
+
+        :return: Tuple: The status code, the headers, and the body of the recorded response. If there isn't a recorded response, this is None.
+        """
+
+        key = (method, Recording.get_url(method=method, url=url))
+        with self.__lock:
+            if key not in self.__responses:
+                return None
+            status_code, headers, body = self.__responses[key]
+        return status_code, headers, self.directory.joinpath("bodies", f"{body}.bin").read_bytes()
+
+    def __len__(self) -> int:
+        return len(self.__responses)
+
+    @staticmethod
+    def get_url(method: str, url: str) -> str:
+        """
+        :param method: The request method, for example `"GET"`.
+        :param url: The URL, including query parameters.
+
+        :return: The URL, encoded the same way that it is encoded when it is sent.
+        """
+
+        return Request(method, url).prepare().url
+
+
+class ReplayServer:
+    """
+    A local stand-in HTTP server that serves a `Recording` instead of Wikipedia and Wikimedia.
+
+    To send requests to this server, set `HttpSession.HOSTS` to `server.get_hosts()`.
+    The server can add latency to each response and randomly respond with errors. The errors are deterministic given the seed.
+    Requests that aren't in the recording get a 404 response.
+    """
+
+    """:class_var
+    The hosts that are replaced by the server by default.
+    """
+    HOSTS: List[str] = ["https://en.wikipedia.org", "https://upload.wikimedia.org"]
+
+    def __init__(self, recording: Recording, latency: float = 0, error_rate: float = 0, error_status_code: int = 503,
+                 seed: int = 0, port: int = 0):
+        """
+        :param recording: The recording.
+        :param latency: Wait this many seconds before sending each response.
+        :param error_rate: The probability, between 0 and 1, that a request gets an error response.
+        :param error_status_code: The status code of error responses.
+        :param seed: The random seed of the errors.
+        :param port: The port. If 0, use any free port.
+        """
+
+        """:field
+        The recording.
+        """
+        self.recording: Recording = recording
+        """:field
+        Wait this many seconds before sending each response.
+        """
+        self.latency: float = latency
+        """:field
+        The probability, between 0 and 1, that a request gets an error response.
+        """
+        self.error_rate: float = error_rate
+        """:field
+        The status code of error responses.
+        """
+        self.error_status_code: int = error_status_code
+        """:field
+        The random seed of the errors.
+        """
+        self.seed: int = seed
+        """:field
+        The number of requests per status code.
+        """
+        self.status_codes: Dict[int, int] = dict()
+        """:field
+        The URLs of requests that weren't in the recording.
+        """
+        self.missing: List[str] = list()
+        # Key = (method, URL). Value = The number of times that the URL was requested.
+        self.__num_requests: Dict[Tuple[str, str], int] = dict()
+        self.__lock: Lock = Lock()
+        self.__server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", port), ReplayServer.__get_handler(self))
+        self.__server.daemon_threads = True
+        self.__thread: Optional[Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        :return: The URL of the server.
+        """
+
+        return f"http://127.0.0.1:{self.__server.server_address[1]}"
+
+    def start(self) -> None:
+        """
+        Start the server in a background thread.
+        """
+
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the server.
+        """
+
+        # `shutdown()` waits for the server loop to end, so it would never return if the server wasn't started.
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread = None
+        self.__server.server_close()
+
+    def get_hosts(self, hosts: List[str] = None) -> Dict[str, str]:
+        """
+        :param hosts: The scheme and host of each URL that should be replaced by this server. If None, use `ReplayServer.HOSTS`.
+
+        :return: A dictionary for `HttpSession.HOSTS`. Key = The scheme and host. Value = The scheme and host replaced with this server.
+        """
+
+        if hosts is None:
+            hosts = ReplayServer.HOSTS
+        replaced = dict()
+        for host in hosts:
+            url = urlsplit(host)
+            replaced[host] = f"{self.url}/{url.scheme}/{url.netloc}"
+        return replaced
+
+    def respond(self, method: str, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        :param method: The request method, for example `"GET"`.
+        :param path: The path of the request, including query parameters.
+
+        :return: Tuple: The status code, the headers, and the body of the response.
+        """
+
+        # Get the original URL.
+        scheme, url = path[1:].split("/", 1)
+        url = f"{scheme}://{url}"
+        with self.__lock:
+            key = (method, url)
+            if key not in self.__num_requests:
+                self.__num_requests[key] = 0
+            self.__num_requests[key] += 1
+            # The same request gets the same sequence of errors.
+            error = Random(f"{self.seed}:{method}:{url}:{self.__num_requests[key]}").random() < self.error_rate
+        if self.latency > 0:
+            sleep(self.latency)
+        if error:
+            resp = (self.error_status_code, {"Content-Type": "text/plain"}, b"")
+        else:
+            resp = self.recording.get(method=method, url=url)
+            # If there is a recorded GET response but no HEAD response, use the status code and headers of the GET response.
+            if resp is None and method == "HEAD":
+                resp = self.recording.get(method="GET", url=url)
+            if resp is None:
+                resp = (404, {"Content-Type": "text/plain"}, b"")
+                with self.__lock:
+                    self.missing.append(url)
+        with self.__lock:
+            if resp[0] not in self.status_codes:
+                self.status_codes[resp[0]] = 0
+            self.status_codes[resp[0]] += 1
+        return resp
+
+    @staticmethod
+    def __get_handler(server: "ReplayServer") -> type:
+        """
+        :param server: The replay server.
+
+        :return: A request handler class for the server.
+        """
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections alive.
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self.__send(method="GET")
+
+            def do_HEAD(self) -> None:
+                self.__send(method="HEAD")
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def __send(self, method: str) -> None:
+                status_code, headers, content = server.respond(method=method, path=self.path)
+                self.send_response(status_code)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if method != "HEAD":
+                    self.wfile.write(content)
+
+        return Handler
@@ -0,0 +1,112 @@
+import os
+from hashlib import sha256
+from threading import Lock
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+from procemon.paths import CACHE_DIRECTORY
+
+
+class SpriteCache:
+    """
+    Grayscale sprites converted from images, shared by every process that generates a dex. Key = The URL of the image.
+
+    The sprites are stored in a single memory-mapped file of fixed-size records. Each record is the hash of a URL and a sprite.
+    New sprites are appended to the file, so many threads and processes can add sprites at the same time.
+    Records that other processes appended to the file are read the next time a URL isn't found.
+    """
+
+    """:class_var
+    The width and height of a sprite in pixels.
+    """
+    SIZE: int = 32
+    """:class_var
+    The path to the cache file.
+    """
+    PATH: Path = CACHE_DIRECTORY.joinpath(f"sprites_{SIZE}x{SIZE}.bin")
+    """:class_var
+    The data type of a record in the cache file. The key is stored as raw bytes because numpy strips trailing zero bytes from byte strings.
+    """
+    DTYPE: np.dtype = np.dtype([("key", "u1", (32,)), ("sprite", "u1", (SIZE, SIZE))])
+    # Key = The hash of a URL. Value = The index of the record.
+    _INDEX: Dict[bytes, int] = dict()
+    # The memory-mapped records.
+    _RECORDS: Optional[np.memmap] = None
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get(url: str) -> Optional[np.ndarray]:
+        """
+        :param url: The URL of the image.
+
+        :return: The sprite as a grayscale numpy array, or None if it isn't cached.
+        """
+
+        key = SpriteCache.get_key(url)
+        with SpriteCache._LOCK:
+            if key not in SpriteCache._INDEX:
+                SpriteCache.__read()
+                if key not in SpriteCache._INDEX:
+                    return None
+            return np.array(SpriteCache._RECORDS[SpriteCache._INDEX[key]]["sprite"])
+
+    @staticmethod
+    def add(url: str, sprite: np.ndarray) -> None:
+        """
+        Cache a sprite.
+
+        :param url: The URL of the image.
+        :param sprite: The sprite as a grayscale numpy array. The shape must be `(SpriteCache.SIZE, SpriteCache.SIZE)`.
+        """
+
+        assert sprite.shape == (SpriteCache.SIZE, SpriteCache.SIZE), f"Bad sprite shape: {sprite.shape}"
+        record = np.zeros(1, dtype=SpriteCache.DTYPE)
+        record["key"] = np.frombuffer(SpriteCache.get_key(url), dtype=np.uint8)
+        record["sprite"] = sprite
+        with SpriteCache._LOCK:
+            if not SpriteCache.PATH.parent.exists():
+                SpriteCache.PATH.parent.mkdir(parents=True, exist_ok=True)
+            # Append the record with a single write so that processes can't interleave their records.
+            fd = os.open(str(SpriteCache.PATH.resolve()), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record.tobytes())
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def get_key(url: str) -> bytes:
+        """
+        :param url: The URL of the image.
+
+        :return: The key of the URL in the cache file.
+        """
+
+        return sha256(url.encode("utf-8")).digest()
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Forget the records that have been read. This doesn't delete the cache file.
+        """
+
+        with SpriteCache._LOCK:
+            SpriteCache._INDEX.clear()
+            SpriteCache._RECORDS = None
+
+    @staticmethod
+    def __read() -> None:
+        """
+        Memory-map the cache file and index any records that haven't been indexed yet.
+        """
+
+        if not SpriteCache.PATH.exists():
+            return
+        # Ignore a record that another process hasn't finished writing yet.
+        num_records = SpriteCache.PATH.stat().st_size // SpriteCache.DTYPE.itemsize
+        num_indexed = 0 if SpriteCache._RECORDS is None else SpriteCache._RECORDS.shape[0]
+        if num_records <= num_indexed:
+            return
+        SpriteCache._RECORDS = np.memmap(str(SpriteCache.PATH.resolve()), dtype=SpriteCache.DTYPE, mode="r",
+                                         shape=(num_records,))
+        for i, key in enumerate(SpriteCache._RECORDS["key"][num_indexed:]):
+            SpriteCache._INDEX[key.tobytes()] = num_indexed + i
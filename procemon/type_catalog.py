@@ -0,0 +1,161 @@
+import mmap
+from json import loads, dumps
+from struct import pack, unpack
+from threading import Lock
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from procemon.paths import CACHE_DIRECTORY, TYPES_DIRECTORY
+from procemon.monster_type import MonsterType
+from procemon.atomic_file import AtomicFile
+
+
+class TypeCatalog:
+    """
+    All of the monster types, compiled from the type JSON files into a single memory-mapped file.
+
+    The file starts with an index of the names of the types and where each type's data is in the file.
+    Reading the index doesn't read any of the types. A `MonsterType` is read from the file only when it is requested.
+    The file is built again if any of the type JSON files are added, removed, or changed.
+    """
+
+    """:class_var
+    The path to the catalog file.
+    """
+    PATH: Path = CACHE_DIRECTORY.joinpath("type_catalog.bin")
+    # Key = The name of a type. Value = (The offset of the type's data from the end of the index, the length of the data).
+    _INDEX: Optional[Dict[str, Tuple[int, int]]] = None
+    # The memory-mapped catalog file.
+    _DATA: Optional[mmap.mmap] = None
+    # The offset of the end of the index.
+    _START: int = 0
+    _LOCK: Lock = Lock()
+
+    @staticmethod
+    def get_names() -> List[str]:
+        """
+        :return: The sorted names of all of the monster types.
+        """
+
+        with TypeCatalog._LOCK:
+            TypeCatalog.__load()
+            return list(TypeCatalog._INDEX.keys())
+
+    @staticmethod
+    def get(monster_type: str) -> MonsterType:
+        """
+        :param monster_type: The name of the type.
+
+        :return: A new `MonsterType` read from the catalog file.
+        """
+
+        with TypeCatalog._LOCK:
+            TypeCatalog.__load()
+            if monster_type not in TypeCatalog._INDEX:
+                raise Exception(f"Monster type not found: {monster_type}")
+            offset, length = TypeCatalog._INDEX[monster_type]
+            offset += TypeCatalog._START
+            data = TypeCatalog._DATA[offset: offset + length]
+        return MonsterType(**loads(data.decode("utf-8")))
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Close the catalog file. The next time a type is requested, the file will be checked again and rebuilt if it's stale.
+        """
+
+        with TypeCatalog._LOCK:
+            TypeCatalog.__close()
+            TypeCatalog._INDEX = None
+            TypeCatalog._START = 0
+
+    @staticmethod
+    def __load() -> None:
+        """
+        Memory-map the catalog file and read its index. If the file doesn't exist or is stale, build it first.
+        """
+
+        if TypeCatalog._INDEX is not None:
+            return
+        sources = TypeCatalog.__get_sources()
+        header = TypeCatalog.__read()
+        if header is None or header["sources"] != sources:
+            TypeCatalog.__close()
+            TypeCatalog.__build(sources=sources)
+            header = TypeCatalog.__read()
+            if header is None:
+                raise Exception(f"Failed to read the type catalog: {TypeCatalog.PATH}")
+        TypeCatalog._INDEX = {k: (v[0], v[1]) for k, v in header["types"].items()}
+
+    @staticmethod
+    def __close() -> None:
+        """
+        Close the memory-mapped catalog file, if it's open. This doesn't delete the file.
+        """
+
+        if TypeCatalog._DATA is not None:
+            TypeCatalog._DATA.close()
+            TypeCatalog._DATA = None
+
+    @staticmethod
+    def __read() -> Optional[dict]:
+        """
+        Memory-map the catalog file.
+
+        :return: The header of the file, or None if the file doesn't exist or is invalid.
+        """
+
+        try:
+            with TypeCatalog.PATH.open("rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The file doesn't exist or it's empty.
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            # The first 8 bytes are the length of the header.
+            length = unpack("<Q", data[:8])[0]
+            header = loads(data[8: 8 + length].decode("utf-8"))
+        except Exception:
+            data.close()
+            return None
+        TypeCatalog._DATA = data
+        TypeCatalog._START = 8 + length
+        return header
+
+    @staticmethod
+    def __build(sources: List[list]) -> None:
+        """
+        Build the catalog file from the type JSON files.
+
+        :param sources: The name, size, and modification time of each type JSON file.
+        """
+
+        types: Dict[str, List[int]] = dict()
+        blobs: List[bytes] = list()
+        offset = 0
+        for source in sources:
+            td = loads(TYPES_DIRECTORY.joinpath(source[0]).read_text(encoding="utf-8"))
+            blob = dumps(td).encode("utf-8")
+            types[td["monster_type"]] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        # Sort the index by name.
+        types = {k: types[k] for k in sorted(types)}
+        header = dumps({"sources": sources, "types": types}).encode("utf-8")
+        with AtomicFile.open(TypeCatalog.PATH) as f:
+            f.write(pack("<Q", len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+
+    @staticmethod
+    def __get_sources() -> List[list]:
+        """
+        :return: The name, size, and modification time of each type JSON file, sorted by name.
+        """
+
+        sources = list()
+        for f in sorted(TYPES_DIRECTORY.iterdir()):
+            if f.is_file() and f.suffix == ".json":
+                stat = f.stat()
+                sources.append([f.name, stat.st_size, stat.st_mtime])
+        return sources
@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional, Set, TYPE_CHECKING
 from zipfile import ZipFile
 from json import loads, dumps
+import numpy as np
 from requests import get
-from gensim.models import KeyedVectors
 from procemon.paths import MOVES_DIRECTORY, WORD_VEC_DIRECTORY, TYPES_DIRECTORY
+if TYPE_CHECKING:
+    from gensim.models import KeyedVectors
 
 
 class WV:
@@ -20,6 +22,11 @@ class WV:
     When searching for words similar to a monster type, search for this many.
     """
     TOPN: int = 30
+    """:class_var
+    Words that define an "attack verb". If one of these words isn't in the word vector model, it and the words after it are ignored.
+    """
+    ATTACK_WORDS: List[str] = ["attack", "assault", "battle", "clash", "kill", "fight", "punch", "kick", "slash",
+                               "strike", "defend"]
 
     def __init__(self, quiet: bool = False):
         """
@@ -46,15 +53,26 @@ class WV:
         """:field
         The word vectors model.
         """
-        self.wv: KeyedVectors = self.get_word_vector_model()
-
-    def get_word_vector_model(self) -> KeyedVectors:
+        self.wv: "KeyedVectors" = self.get_word_vector_model()
+        # The verbs and adjectives that are in the model, and their normalized vectors.
+        # Distances between many words are computed at once with matrix products of these vectors.
+        self.__model_verbs: np.ndarray = np.array([v for v in self.verbs if v in self.wv], dtype=object)
+        self.__verb_vectors: np.ndarray = self.get_unit_vectors(words=list(self.__model_verbs))
+        self.__model_adjectives: np.ndarray = np.array([a for a in self.adjectives if a in self.wv], dtype=object)
+        self.__adjective_vectors: np.ndarray = self.get_unit_vectors(words=list(self.__model_adjectives))
+        # The distance between each verb in the model and the nearest attack word. This is set the first time it's needed.
+        self.__attack_distances: Optional[np.ndarray] = None
+
+    def get_word_vector_model(self) -> "KeyedVectors":
         """
         Get the loaded WordVector model. Download the file if it doesn't already exist.
 
         :return: The word vector KeyedVectors model.
         """
 
+        # gensim is slow to import and is only needed to load the model.
+        from gensim.models import KeyedVectors
+
         if not WORD_VEC_DIRECTORY.exists():
             WORD_VEC_DIRECTORY.mkdir(parents=True)
         word_vec_path = WORD_VEC_DIRECTORY.joinpath("glove.txt")
@@ -77,6 +95,21 @@ class WV:
             print("Loading word vector model (be patient!)...")
         return KeyedVectors.load_word2vec_format(str(word_vec_path.resolve()), binary=False)
 
+    def get_unit_vectors(self, words: List[str]) -> np.ndarray:
+        """
+        :param words: Words that are in the word vector model.
+
+        :return: A 2D numpy array of the normalized vector of each word. The distance between two words is `1 - np.dot(a, b)`.
+        """
+
+        if len(words) == 0:
+            return np.zeros((0, self.wv.vector_size), dtype=np.float32)
+        vectors = np.array(self.wv[words], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # A zero vector stays zero, so its distance to every word is 1.
+        norms[norms == 0] = 1
+        return vectors / norms
+
     def get_attack_verbs(self, distance: float = 0.5, write: bool = False) -> List[str]:
         """
         :param distance: The verb must be this close to an "attack verb".
@@ -85,26 +118,7 @@ class WV:
         :return: A list of all verbs that are nearby an "attack" verb.
         """
 
-        attack_verbs: List[str] = list()
-        for v in self.verbs:
-            if len(v) <= 3:
-                continue
-            done = False
-            for av in ["attack", "assault", "battle", "clash", "kill", "fight", "punch", "kick", "slash", "strike",
-                       "defend"]:
-                if done:
-                    break
-                # If the verb is nearby an "attack verb", add it to the list.
-                try:
-                    d = self.wv.distance(v, av)
-                    if d < distance:
-                        attack_verbs.append(v)
-                        done = True
-                # This word isn't isn't in the word vector model. Ignore it.
-                except KeyError:
-                    done = True
-        # Remove duplicates.
-        attack_verbs = list(sorted(set(attack_verbs)))
+        attack_verbs: List[str] = list(sorted(set(self.__model_verbs[self.__get_attack_distances() < distance])))
         # Write the list to disk.
         if write:
             MOVES_DIRECTORY.joinpath("attack_verbs.txt").write_text("\n".join(attack_verbs), encoding="utf-8")
@@ -125,45 +139,35 @@ class WV:
         # Maximum distance between the monster type keyword and a verb.
         max_distance: float = 0.6
 
+        attack_distances = self.__get_attack_distances()
+        # If the monster type isn't in the model, no verbs are nearby it.
+        if monster_type in self.wv:
+            type_distances = 1 - self.__verb_vectors.dot(self.get_unit_vectors(words=[monster_type])[0])
+            near_type = type_distances < max_distance
+        else:
+            near_type = np.zeros(len(self.__model_verbs), dtype=bool)
         # Get enough verbs for this type.
         # If we don't get enough verbs, increase the maximum action verb distance and try again.
-        type_verbs: List[str] = list()
+        type_verbs: Set[str] = set()
         while action_verb_distance < 1 and len(type_verbs) < WV.MIN_WORDS:
-            # Get the action verbs at a given distance.
-            action_verbs: List[str] = self.get_attack_verbs(distance=action_verb_distance)
-            for v in self.verbs:
-                # Ignore short verbs, words already in the list, or words that aren't in `action_verbs`.
-                if len(v) <= 3 or v not in action_verbs or v in type_verbs:
-                    continue
-                # If the verb is nearby the monster type, add it to the list.
-                try:
-                    d = self.wv.distance(v, monster_type)
-                    if d < max_distance:
-                        type_verbs.append(v)
-                except KeyError:
-                    continue
+            # Get the verbs that are action verbs at this distance and are nearby the monster type.
+            type_verbs.update(self.__model_verbs[(attack_distances < action_verb_distance) & near_type])
             # Increase the maximum distance from action verbs and try again.
             action_verb_distance += 0.1
-        type_verbs = list(sorted(set(type_verbs)))
         # We often need more verbs for a monster type (but not, interestingly, more adjectives).
         # Try to get some from words that are similar to the monster type.
         if len(type_verbs) < WV.MIN_WORDS:
             most_similar = self.wv.most_similar(monster_type, topn=WV.TOPN)
-            action_verbs: List[str] = self.get_attack_verbs(distance=0.6)
-            for ms in most_similar:
+            action_verbs = attack_distances < 0.6
+            # The distance between each verb and each similar word.
+            similar_distances = 1 - self.__verb_vectors.dot(
+                self.get_unit_vectors(words=[ms[0] for ms in most_similar]).T)
+            for i in range(len(most_similar)):
                 if len(type_verbs) >= WV.MIN_WORDS:
                     break
-                for v in self.verbs:
-                    if len(v) <= 3 or v not in action_verbs or v in type_verbs:
-                        continue
-                    # If the verb is nearby the monster type, add it to the list.
-                    try:
-                        d = self.wv.distance(v, ms[0])
-                        if d < max_distance:
-                            type_verbs.append(v)
-                    except KeyError:
-                        continue
-        return list(sorted(set(type_verbs)))
+                # Add the action verbs that are nearby the similar word.
+                type_verbs.update(self.__model_verbs[action_verbs & (similar_distances[:, i] < max_distance)])
+        return list(sorted(type_verbs))
 
     def get_type_adjectives(self, monster_type: str) -> List[str]:
         """
@@ -175,31 +179,44 @@ class WV:
         # Maximum distance between the monster type keyword and an adjective.
         max_distance: float = 0.6
 
-        type_adjectives: List[str] = list()
-        for a in self.adjectives:
-            # If the adjecties is nearby the monster type, add it to the list.
-            try:
-                d = self.wv.distance(a, monster_type)
-                if d < max_distance:
-                    type_adjectives.append(a)
-            except KeyError:
-                continue
-        type_adjectives = list(sorted(set(type_adjectives)))
+        type_adjectives: Set[str] = set()
+        # If the monster type isn't in the model, no adjectives are nearby it.
+        if monster_type in self.wv:
+            type_distances = 1 - self.__adjective_vectors.dot(self.get_unit_vectors(words=[monster_type])[0])
+            type_adjectives.update(self.__model_adjectives[type_distances < max_distance])
         # We occasionally need more adjectives for a monster type.
         # Try to get some from words that are similar to the monster type.
         if len(type_adjectives) < WV.MIN_WORDS:
             most_similar = self.wv.most_similar(monster_type, topn=WV.TOPN)
-            for ms in most_similar:
-                if len(most_similar) >= WV.MIN_WORDS:
+            # The distance between each adjective and each similar word.
+            similar_distances = 1 - self.__adjective_vectors.dot(
+                self.get_unit_vectors(words=[ms[0] for ms in most_similar]).T)
+            for i in range(len(most_similar)):
+                if len(type_adjectives) >= WV.MIN_WORDS:
+                    break
+                type_adjectives.update(self.__model_adjectives[similar_distances[:, i] < max_distance])
+        return list(sorted(type_adjectives))
+
+    def __get_attack_distances(self) -> np.ndarray:
+        """
+        :return: The distance between each verb in the model and the nearest attack word. Verbs with 3 or fewer letters are infinitely far away.
+        """
+
+        if self.__attack_distances is None:
+            # Stop at the first attack word that isn't in the model.
+            attack_words: List[str] = list()
+            for aw in WV.ATTACK_WORDS:
+                if aw not in self.wv:
                     break
-                for a in self.adjectives:
-                    try:
-                        d = self.wv.distance(a, ms[0])
-                        if d < max_distance:
-                            type_adjectives.append(a)
-                    except KeyError:
-                        continue
-        return list(sorted(set(type_adjectives)))
+                attack_words.append(aw)
+            if len(attack_words) == 0:
+                distances = np.full(len(self.__model_verbs), np.inf, dtype=np.float32)
+            else:
+                distances = (1 - self.__verb_vectors.dot(self.get_unit_vectors(words=attack_words).T)).min(axis=1)
+            # Ignore short verbs.
+            distances[np.array([len(v) <= 3 for v in self.__model_verbs], dtype=bool)] = np.inf
+            self.__attack_distances = distances
+        return self.__attack_distances
 
 
 if __name__ == "__main__":
@@ -209,7 +226,9 @@ if __name__ == "__main__":
     all_types: List[str] = list()
     monster_types = list()
     # Get verbs and adjectives for each monster type.
-    for f in TYPES_DIRECTORY.iterdir():
+    for f in sorted(TYPES_DIRECTORY.iterdir()):
+        if f.suffix != ".json":
+            continue
         monster_data = loads(f.read_text(encoding="utf-8"))
         mt: str = monster_data["monster_type"]
         print(mt)
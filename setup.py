@@ -5,7 +5,7 @@ readme = Path('README.md').read_text(encoding='utf-8')
 
 setup(
     name='procemon',
-    version="1.5.3",
+    version="1.6.0",
     description='Procedurally generated trading card game',
     long_description=readme,
     long_description_content_type='text/markdown',
@@ -18,13 +18,13 @@ setup(
         'Intended Audience :: Developers',
         'Topic :: Software Development',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8'
     ],
     keywords='image pokemon card procgen',
     packages=find_packages(),
+    python_requires=">=3.7",
     include_package_data=True,
-    install_requires=["requests", "markovify", "beautifulsoup4", "gensim", "numpy", "pillow", "fpdf",
+    install_requires=["requests", "markovify", "gensim", "numpy", "pillow", "fpdf",
                       "perlin-numpy @ git+https://github.com/pvigier/perlin-numpy", "Unidecode", "fonttools"]
 )
@@ -0,0 +1,198 @@
+import io
+import json
+from random import Random
+from hashlib import sha256
+from threading import Thread
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import pytest
+from PIL import Image
+from procemon.dex import Dex
+from procemon.monster import Monster
+from procemon.http_cache import HttpCache
+from procemon.http_session import HttpSession
+from procemon.sprite_cache import SpriteCache
+from procemon.markov_cache import MarkovCache
+from procemon.negative_cache import NegativeCache
+from procemon.type_catalog import TypeCatalog
+from procemon.glyph_index import GlyphIndex
+from procemon.noise_bank import NoiseBank
+
+"""
+Fixtures shared by the tests.
+"""
+
+
+class FakeWiki:
+    """
+    A local stand-in for Wikipedia and Wikimedia. Every response is generated from the URL, so the responses are the same every time.
+
+    About 1 in 5 pages don't exist. Every other page has paragraph text and two PNG images.
+    """
+
+    # Words used to generate the paragraph text.
+    WORDS: str = ("the a of monster lives in forest river eats small large animals often found near water and mountains "
+                  "during winter summer it is known for its bright colors strange sounds").split()
+
+    def __init__(self):
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), FakeWiki.__get_handler())
+        self.server.daemon_threads = True
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def get_hosts(self) -> Dict[str, str]:
+        """
+        :return: A dictionary for `HttpSession.HOSTS`.
+        """
+
+        return {host: f"{self.url}/https/{host[8:]}" for host in ["https://en.wikipedia.org",
+                                                                  "https://upload.wikimedia.org"]}
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def exists(title: str) -> bool:
+        return int(sha256(title.lower().encode("utf-8")).hexdigest(), 16) % 5 != 0
+
+    @staticmethod
+    def get_text(title: str) -> str:
+        r = Random(title)
+        return "\n".join(" ".join(r.choice(FakeWiki.WORDS) for _ in range(40)).capitalize() + ". " +
+                         " ".join(r.choice(FakeWiki.WORDS) for _ in range(30)) + "." for _ in range(6))
+
+    @staticmethod
+    def get_image(path: str) -> bytes:
+        rng = np.random.RandomState(int(sha256(path.encode("utf-8")).hexdigest(), 16) % 2 ** 31)
+        b = io.BytesIO()
+        Image.fromarray(rng.randint(0, 255, (300, 400, 3)).astype(np.uint8)).save(b, "PNG")
+        return b.getvalue()
+
+    @staticmethod
+    def respond(path: str) -> Tuple[int, str, bytes]:
+        """
+        :param path: The path of the request, including query parameters.
+
+        :return: Tuple: The status code, the Content-Type, and the body.
+        """
+
+        url = urlsplit(path)
+        if url.path.startswith("/https/upload.wikimedia.org/"):
+            return 200, "image/png", FakeWiki.get_image(url.path)
+        if url.path.startswith("/https/en.wikipedia.org/wiki/"):
+            return 404, "text/html", b""
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        # TextExtracts.
+        if query.get("prop") == "extracts":
+            title = query["titles"]
+            if FakeWiki.exists(title):
+                pages = {"5": {"title": title, "extract": FakeWiki.get_text(title)}}
+            else:
+                pages = {"-1": {"title": title, "missing": ""}}
+            return 200, "application/json", json.dumps({"query": {"pages": pages}}).encode("utf-8")
+        # The images of pages, or the URLs of the images of pages.
+        titles = query["titles"].split("|")
+        normalized = [{"from": t, "to": t[0].upper() + t[1:]} for t in titles if t[0].islower()]
+        titles = [t[0].upper() + t[1:] for t in titles]
+        files = {t: [f"File:{t}_{i}.png" for i in range(2)] for t in titles if FakeWiki.exists(t)}
+        if query.get("generator") == "images":
+            pages = {str(-1 - i): {"title": f, "missing": "",
+                                   "imageinfo": [{"url": f"https://upload.wikimedia.org/{f[5:]}".replace(" ", "_")}]}
+                     for i, f in enumerate(f for fs in files.values() for f in fs)}
+        else:
+            pages = {str(i): {"title": t, "images": [{"title": f} for f in files[t]]} if t in files else
+                     {"title": t, "missing": ""} for i, t in enumerate(titles)}
+        return 200, "application/json", json.dumps({"query": {"normalized": normalized,
+                                                              "pages": pages}}).encode("utf-8")
+
+    @staticmethod
+    def __get_handler() -> type:
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self.__send(head=False)
+
+            def do_HEAD(self) -> None:
+                self.__send(head=True)
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def __send(self, head: bool) -> None:
+                status_code, content_type, body = FakeWiki.respond(self.path)
+                self.send_response(status_code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+
+        return Handler
+
+
+@pytest.fixture(scope="session")
+def noise_directory(tmp_path_factory) -> Path:
+    """
+    :return: A directory for the noise bank that is shared by every test, so that the noise fields are generated only once.
+    """
+
+    return tmp_path_factory.mktemp("noise")
+
+
+@pytest.fixture
+def caches(tmp_path: Path, monkeypatch, noise_directory: Path) -> Iterator[Path]:
+    """
+    Redirect every on-disk cache to an empty directory and clear the in-memory caches.
+
+    :return: The cache directory.
+    """
+
+    directory = tmp_path.joinpath("cache")
+    monkeypatch.setattr(HttpCache, "DIRECTORY", directory.joinpath("http"))
+    monkeypatch.setattr(HttpCache, "_SIZE", None)
+    monkeypatch.setattr(HttpCache, "OFFLINE", False)
+    monkeypatch.setattr(SpriteCache, "PATH", directory.joinpath("sprites.bin"))
+    monkeypatch.setattr(MarkovCache, "DIRECTORY", directory.joinpath("markov"))
+    monkeypatch.setattr(TypeCatalog, "PATH", directory.joinpath("type_catalog.bin"))
+    monkeypatch.setattr(GlyphIndex, "PATH", directory.joinpath("glyph_index.json"))
+    monkeypatch.setattr(NoiseBank, "DIRECTORY", noise_directory)
+    monkeypatch.setattr(Dex, "NO_IMAGES", NegativeCache(log_path=directory.joinpath("no_images.log"),
+                                                        seed_path=Dex.NO_IMAGES.seed_path))
+    monkeypatch.setattr(Monster, "BAD_WIKIPEDIA_URLS",
+                        NegativeCache(log_path=directory.joinpath("bad_wikipedia_urls.log"),
+                                      seed_path=Monster.BAD_WIKIPEDIA_URLS.seed_path))
+    monkeypatch.setattr(Monster, "WIKIPEDIA", dict())
+    monkeypatch.setattr(Dex, "REGION_MODEL_PATH", directory.joinpath("region_model.json"))
+    monkeypatch.setattr(Dex, "_REGION_MODEL", None)
+    SpriteCache.clear()
+    MarkovCache.clear()
+    TypeCatalog.clear()
+    GlyphIndex.clear()
+    yield directory
+    # Forget anything that was read from the cache directory.
+    SpriteCache.clear()
+    MarkovCache.clear()
+    TypeCatalog.clear()
+    GlyphIndex.clear()
+
+
+@pytest.fixture
+def wiki(monkeypatch) -> Iterator[FakeWiki]:
+    """
+    Start a `FakeWiki` and send every request to Wikipedia and Wikimedia to it.
+
+    :return: The fake wiki.
+    """
+
+    fake_wiki = FakeWiki()
+    monkeypatch.setattr(HttpSession, "HOSTS", fake_wiki.get_hosts())
+    yield fake_wiki
+    fake_wiki.stop()
@@ -0,0 +1,37 @@
+import random
+from pathlib import Path
+from typing import Dict
+import numpy as np
+from procemon.dex import Dex
+from procemon.move import Move
+
+"""
+Cards are the same given the same seed, regardless of the number of workers.
+"""
+
+
+def create_cards(directory: Path, monkeypatch, workers: int) -> Dict[str, bytes]:
+    """
+    :param directory: The working directory. The dex is written to dst/ in this directory.
+    :param monkeypatch: The monkeypatch fixture.
+    :param workers: The number of processes that will render cards.
+
+    :return: The cards. Key = The file name. Value = The PNG file.
+    """
+
+    directory.mkdir()
+    monkeypatch.chdir(directory)
+    # The moods are chosen once per process. Choose them again, as if this dex were generated in a new process.
+    monkeypatch.setattr(Move, "MOODS", list())
+    random.seed(0)
+    np.random.seed(0)
+    dex = Dex(num_types=2, num_monsters_per_type=3, quiet=True)
+    dex.create_cards(quiet=True, workers=workers, seed=0)
+    return {f.name: f.read_bytes() for f in dex.dst.iterdir() if f.suffix == ".png"}
+
+
+def test_workers(tmp_path: Path, monkeypatch, caches: Path, wiki):
+    # The first dex is generated with empty caches and the second dex reuses them.
+    cards = create_cards(directory=tmp_path.joinpath("w1"), monkeypatch=monkeypatch, workers=1)
+    assert len(cards) == 6
+    assert create_cards(directory=tmp_path.joinpath("w2"), monkeypatch=monkeypatch, workers=2) == cards
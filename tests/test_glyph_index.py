@@ -0,0 +1,47 @@
+import os
+import shutil
+from json import loads
+from pathlib import Path
+import fontTools.ttLib
+from procemon.paths import TEXT_FONT
+from procemon.glyph_index import GlyphIndex, TranslationTable
+
+"""
+Round trips through the glyph index file.
+"""
+
+
+def test_index(caches: Path, tmp_path: Path, monkeypatch):
+    font_path = tmp_path.joinpath("font.ttf")
+    shutil.copyfile(str(TEXT_FONT.resolve()), str(font_path.resolve()))
+    characters = GlyphIndex.get(font_path)
+    assert "A" in characters
+    index = loads(GlyphIndex.PATH.read_text(encoding="utf-8"))
+    stat = font_path.stat()
+    assert index[str(font_path.resolve())]["stamp"] == [stat.st_size, stat.st_mtime]
+    assert set(index[str(font_path.resolve())]["characters"]) == set(ord(c) for c in characters)
+
+    # Read the characters from the index file without parsing the font.
+    class NoFont:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("The font was parsed.")
+
+    with monkeypatch.context() as m:
+        m.setattr(fontTools.ttLib, "TTFont", NoFont)
+        GlyphIndex.clear()
+        assert GlyphIndex.get(font_path) == characters
+    # The font file changed, so it's parsed again.
+    GlyphIndex.clear()
+    os.utime(str(font_path.resolve()), (stat.st_atime + 10, stat.st_mtime + 10))
+    assert GlyphIndex.get(font_path) == characters
+    index = loads(GlyphIndex.PATH.read_text(encoding="utf-8"))
+    assert index[str(font_path.resolve())]["stamp"] == [stat.st_size, stat.st_mtime + 10]
+
+
+def test_translation_table():
+    table = TranslationTable(frozenset("abcé"))
+    assert "abcé".translate(table) == "abcé"
+    # Unsupported characters are converted.
+    assert "ñø".translate(table) == "no"
+    assert table[ord("ñ")] == "n"
+    assert table[ord("a")] == ord("a")
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+import pytest
+from procemon.http_cache import HttpCache, CachedResponse, CacheMissError
+
+"""
+Round trips through the on-disk HTTP cache.
+"""
+
+
+def get_size() -> int:
+    """
+    :return: The total size of the cached responses on disk.
+    """
+
+    return sum(f.stat().st_size for f in HttpCache.DIRECTORY.glob("*/*.bin"))
+
+
+def test_save_load(caches: Path):
+    url = "https://en.wikipedia.org/w/api.php"
+    params = {"action": "query", "titles": "Fire|Water"}
+    resp = CachedResponse(url=HttpCache.get_url(url=url, params=params), status_code=200,
+                          headers={"Content-Type": "application/json", "Content-Length": "2"}, content=b"{}")
+    HttpCache.save(resp)
+    loaded = HttpCache.load(url=url, params=params)
+    assert loaded.content == b"{}"
+    assert loaded.json() == dict()
+    # Only the Content-Type header is cached.
+    assert loaded.headers == {"Content-Type": "application/json"}
+    assert HttpCache.load(url=url, params={"action": "query", "titles": "Fire"}) is None
+    # The response is too old.
+    assert HttpCache.load(url=url, params=params, ttl=-1) is None
+    # Offline, old responses are still used.
+    HttpCache.OFFLINE = True
+    assert HttpCache.load(url=url, params=params, ttl=-1).content == b"{}"
+
+
+def test_replace(caches: Path):
+    # Replacing a response doesn't count the size of the old response.
+    for i in range(20):
+        HttpCache.save(CachedResponse(url=f"https://upload.wikimedia.org/{i % 4}.png", status_code=200,
+                                      headers={"Content-Type": "image/png"}, content=b"x" * (100 + i)))
+    assert HttpCache._SIZE == get_size() == sum(100 + i for i in range(16, 20))
+
+
+def test_evict(caches: Path, monkeypatch):
+    monkeypatch.setattr(HttpCache, "MAX_SIZE", 1000)
+    for i in range(9):
+        url = f"https://upload.wikimedia.org/{i}.png"
+        HttpCache.save(CachedResponse(url=url, status_code=200, headers={"Content-Type": "image/png"},
+                                      content=b"x" * 100))
+        # Make sure that the files are in order from least to most recently used.
+        t = 1000000 + i
+        os.utime(str(HttpCache.get_path(url).resolve()), (t, t))
+    assert HttpCache._SIZE == 900
+    HttpCache.save(CachedResponse(url="https://upload.wikimedia.org/9.png", status_code=200,
+                                  headers={"Content-Type": "image/png"}, content=b"x" * 200))
+    # The least recently used responses were deleted until the cache is 90% of the maximum size.
+    assert HttpCache._SIZE == get_size() <= 900
+    assert HttpCache.load("https://upload.wikimedia.org/0.png") is None
+    assert HttpCache.load("https://upload.wikimedia.org/9.png") is not None
+
+
+def test_get(caches: Path, wiki):
+    url = "https://upload.wikimedia.org/Fire_0.png"
+    resp = HttpCache.get(url, content_type="image")
+    assert resp.status_code == 200
+    assert resp.content[:4] == b"\x89PNG"
+    # Rejected responses aren't returned.
+    assert HttpCache.get(url, content_type="text") is None
+    assert HttpCache.get(url, max_bytes=10) is None
+    # The response is cached.
+    HttpCache.OFFLINE = True
+    assert HttpCache.get(url).content == resp.content
+    with pytest.raises(CacheMissError):
+        HttpCache.get("https://upload.wikimedia.org/Water_0.png")
@@ -0,0 +1,73 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from procemon.markov_cache import MarkovCache
+from procemon.atomic_file import AtomicFile
+
+"""
+Round trips through the Markov model cache and atomic file writes.
+"""
+
+
+def get_text(i: int) -> str:
+    return f"The monster number {i} lives in the forest. It eats small animals. The forest is near a river. " \
+           f"It is known for its bright colors."
+
+
+def test_page_model(caches: Path):
+    text = get_text(0)
+    key = MarkovCache.get_key(text)
+    model = MarkovCache.get_page_model(text)
+    path = MarkovCache.DIRECTORY.joinpath(key[:2], f"{key}.json")
+    assert path.exists()
+    assert list(MarkovCache.DIRECTORY.glob("*/*.tmp")) == []
+    # Load the model from disk.
+    MarkovCache.clear()
+    assert MarkovCache.get_page_model(text).to_json() == model.to_json()
+    # Text without any sentences doesn't have a model.
+    assert MarkovCache.get_page_model("") is None
+
+
+def test_get(caches: Path):
+    texts = [get_text(0), get_text(1)]
+    model = MarkovCache.get(texts)
+    assert model is not None
+    # The order of the pages doesn't matter.
+    assert MarkovCache.get(texts[::-1]) is model
+    assert MarkovCache.HITS == 1
+    assert MarkovCache.MISSES == 1
+    assert MarkovCache.get([""]) is None
+
+
+def test_lru(caches: Path, monkeypatch):
+    monkeypatch.setattr(MarkovCache, "MAX_MODELS", 2)
+    monkeypatch.setattr(MarkovCache, "MAX_PAGE_MODELS", 2)
+    a = MarkovCache.get([get_text(0)])
+    MarkovCache.get([get_text(1)])
+    # Use the first model again, so the second model is the least recently used.
+    assert MarkovCache.get([get_text(0)]) is a
+    MarkovCache.get([get_text(2)])
+    assert len(MarkovCache.MODELS) == 2
+    assert len(MarkovCache._PAGE_MODELS) == 2
+    assert MarkovCache.get([get_text(0)]) is a
+    assert MarkovCache.get([get_text(1)]) is not None
+    assert MarkovCache.MISSES == 4
+
+
+def test_atomic_file(tmp_path: Path):
+    path = tmp_path.joinpath("a", "b.txt")
+    AtomicFile.write(path=path, content=b"old")
+    assert path.read_bytes() == b"old"
+    # If the `with` block raises an exception, the file isn't changed.
+    with pytest.raises(ValueError):
+        with AtomicFile.open(path) as f:
+            f.write(b"new")
+            raise ValueError()
+    assert path.read_bytes() == b"old"
+    assert list(path.parent.iterdir()) == [path]
+    # Many threads write the same file at the same time.
+    contents = [bytes([i]) * 100000 for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda c: AtomicFile.write(path=path, content=c), contents * 4))
+    assert path.read_bytes() in contents
+    assert list(path.parent.iterdir()) == [path]
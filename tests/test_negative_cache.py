@@ -0,0 +1,64 @@
+from pathlib import Path
+import pytest
+from procemon.negative_cache import NegativeCache
+
+"""
+Round trips through the negative cache log.
+"""
+
+
+def test_log(tmp_path: Path, monkeypatch):
+    log_path = tmp_path.joinpath("negative", "bad.log")
+    seed_path = tmp_path.joinpath("seed.txt")
+    seed_path.write_text("seeded\n", encoding="utf-8")
+    cache = NegativeCache(log_path=log_path, seed_path=seed_path)
+    cache.add("permanent")
+    cache.add("transient", transient=True)
+    # This doesn't append a duplicate entry.
+    cache.add("permanent")
+    assert "seeded" in cache
+    assert "permanent" in cache
+    assert "transient" in cache
+    assert "missing" not in cache
+    lines = log_path.read_text(encoding="utf-8").split("\n")
+    assert lines[0] == "inf\tpermanent"
+    assert lines[1].endswith("\ttransient")
+    assert len(lines) == 3
+    # The seed file is never modified.
+    assert seed_path.read_text(encoding="utf-8") == "seeded\n"
+    # Another process reads the entries from the log file.
+    other = NegativeCache(log_path=log_path, seed_path=seed_path)
+    assert "permanent" in other
+    assert "transient" in other
+    # Transient entries expire.
+    monkeypatch.setattr(NegativeCache, "TRANSIENT_TTL", -1)
+    other.add("expired", transient=True)
+    assert "expired" not in other
+
+
+def test_refresh(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(NegativeCache, "REFRESH_INTERVAL", -1)
+    log_path = tmp_path.joinpath("bad.log")
+    a = NegativeCache(log_path=log_path)
+    b = NegativeCache(log_path=log_path)
+    assert "key" not in b
+    a.add("key")
+    # Entries that another process appended are read.
+    assert "key" in b
+
+
+def test_malformed(tmp_path: Path):
+    log_path = tmp_path.joinpath("bad.log")
+    log_path.write_bytes(b"inf\tgood\ngarbage\nnot a number\tbad\n\xff\xfe\tbytes\ninf\tlater\ninf\tunfinished")
+    cache = NegativeCache(log_path=log_path)
+    # Malformed lines are ignored.
+    assert "good" in cache
+    assert "later" in cache
+    assert "bad" not in cache
+    assert "garbage" not in cache
+    # A line that another process hasn't finished writing is ignored.
+    assert "unfinished" not in cache
+    with pytest.raises(Exception):
+        cache.add("tab\tkey")
+    with pytest.raises(Exception):
+        cache.add("newline\nkey")
@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Dict, Tuple
+from procemon.http_cache import HttpCache
+from procemon.http_session import HttpSession
+from procemon.replay import Recording, ReplayServer
+
+"""
+Record responses from the local stand-in wiki, and replay them through the HTTP cache.
+"""
+
+# The URLs and query parameters of the requests.
+REQUESTS = [("https://upload.wikimedia.org/Fire_0.png", None),
+            ("https://en.wikipedia.org/w/api.php", {"action": "query", "format": "json", "prop": "extracts",
+                                                    "explaintext": 1, "redirects": 1, "titles": "Fire"}),
+            ("https://en.wikipedia.org/w/api.php", {"action": "query", "format": "json", "prop": "images",
+                                                    "titles": "fire|water|ice"})]
+
+
+def get_responses() -> Dict[str, Tuple[int, str, bytes]]:
+    """
+    :return: The response of each request. Key = The URL. Value = Tuple: The status code, the Content-Type header, and the body.
+    """
+
+    responses = dict()
+    for url, params in REQUESTS:
+        resp = HttpCache.get(url, params=params)
+        responses[resp.url] = (resp.status_code, resp.headers["Content-Type"], resp.content)
+    return responses
+
+
+def test_record_replay(caches: Path, tmp_path: Path, wiki, monkeypatch):
+    directory = tmp_path.joinpath("recording")
+    monkeypatch.setattr(HttpSession, "RECORDING", Recording(directory))
+    recorded = get_responses()
+    assert len(HttpSession.RECORDING) == len(REQUESTS)
+    HttpSession.RECORDING = None
+    wiki.stop()
+    # Read the recording from disk and replay it with an empty cache.
+    recording = Recording(directory)
+    assert len(recording) == len(REQUESTS)
+    server = ReplayServer(recording=recording)
+    server.start()
+    try:
+        monkeypatch.setattr(HttpSession, "HOSTS", server.get_hosts())
+        monkeypatch.setattr(HttpCache, "DIRECTORY", tmp_path.joinpath("replayed"))
+        assert get_responses() == recorded
+        assert server.status_codes == {200: len(REQUESTS)}
+        # A request that wasn't recorded.
+        resp = HttpSession.get("https://en.wikipedia.org/wiki/Fire")
+        assert resp.status_code == 404
+        assert server.missing == ["https://en.wikipedia.org/wiki/Fire"]
+    finally:
+        server.stop()
+
+
+def test_respond(tmp_path: Path):
+    recording = Recording(tmp_path)
+    recording.add(method="GET", url="https://upload.wikimedia.org/a b.png", status_code=200,
+                  headers={"Content-Type": "image/png", "Content-Length": "3"}, content=b"png")
+    # A recording is replayed without starting the server.
+    server = ReplayServer(recording=recording)
+    try:
+        assert server.respond(method="GET", path="/https/upload.wikimedia.org/a%20b.png") == \
+               (200, {"Content-Type": "image/png"}, b"png")
+        # A HEAD request gets the status code and headers of the GET response.
+        assert server.respond(method="HEAD", path="/https/upload.wikimedia.org/a%20b.png")[0] == 200
+        assert server.respond(method="GET", path="/https/upload.wikimedia.org/c.png")[0] == 404
+    finally:
+        server.stop()
+    # Errors are deterministic given the seed.
+    errors = list()
+    for i in range(2):
+        server = ReplayServer(recording=recording, error_rate=0.5, error_status_code=503, seed=1)
+        try:
+            errors.append([server.respond(method="GET", path="/https/upload.wikimedia.org/a%20b.png")[0]
+                           for _ in range(20)])
+        finally:
+            server.stop()
+    assert errors[0] == errors[1]
+    assert set(errors[0]) == {200, 503}
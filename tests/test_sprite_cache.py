@@ -0,0 +1,43 @@
+from pathlib import Path
+import numpy as np
+from procemon.sprite_cache import SpriteCache
+
+"""
+Round trips through the sprite record file.
+"""
+
+
+def get_sprite(seed: int) -> np.ndarray:
+    return np.random.RandomState(seed).randint(0, 256, (SpriteCache.SIZE, SpriteCache.SIZE)).astype(np.uint8)
+
+
+def test_round_trip(caches: Path):
+    # The hash of "u7" ends with a zero byte.
+    urls = ["https://upload.wikimedia.org/a.png", "u7"]
+    assert SpriteCache.get_key("u7")[-1] == 0
+    for i, url in enumerate(urls):
+        assert SpriteCache.get(url) is None
+        SpriteCache.add(url, get_sprite(i))
+    assert SpriteCache.PATH.stat().st_size == len(urls) * SpriteCache.DTYPE.itemsize
+    for i, url in enumerate(urls):
+        assert np.array_equal(SpriteCache.get(url), get_sprite(i))
+    # Read the records again from the file.
+    SpriteCache.clear()
+    for i, url in enumerate(urls):
+        assert np.array_equal(SpriteCache.get(url), get_sprite(i))
+    assert SpriteCache.get("https://upload.wikimedia.org/b.png") is None
+
+
+def test_append(caches: Path):
+    SpriteCache.add("a", get_sprite(0))
+    assert SpriteCache.get("a") is not None
+    # Another process appends a record after this process read the file.
+    record = np.zeros(1, dtype=SpriteCache.DTYPE)
+    record["key"] = np.frombuffer(SpriteCache.get_key("b"), dtype=np.uint8)
+    record["sprite"] = get_sprite(1)
+    with SpriteCache.PATH.open("ab") as f:
+        f.write(record.tobytes())
+        # A record that another process hasn't finished writing yet.
+        f.write(record.tobytes()[:100])
+    assert np.array_equal(SpriteCache.get("b"), get_sprite(1))
+    assert np.array_equal(SpriteCache.get("a"), get_sprite(0))
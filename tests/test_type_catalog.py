@@ -0,0 +1,81 @@
+import shutil
+from json import loads, dumps
+from struct import unpack
+from pathlib import Path
+import pytest
+import procemon.type_catalog
+from procemon.paths import TYPES_DIRECTORY
+from procemon.type_catalog import TypeCatalog
+
+"""
+Round trips through the type catalog file.
+"""
+
+
+@pytest.fixture
+def types_directory(caches: Path, tmp_path: Path, monkeypatch) -> Path:
+    """
+    :return: A directory with a few monster type JSON files. The catalog is built from this directory.
+    """
+
+    directory = tmp_path.joinpath("types")
+    directory.mkdir()
+    for name in ["apple", "animal", "antenna"]:
+        shutil.copyfile(str(TYPES_DIRECTORY.joinpath(f"{name}.json").resolve()),
+                        str(directory.joinpath(f"{name}.json").resolve()))
+    # This isn't a type file.
+    directory.joinpath("readme.txt").write_text("Not a type.", encoding="utf-8")
+    monkeypatch.setattr(procemon.type_catalog, "TYPES_DIRECTORY", directory)
+    return directory
+
+
+def test_round_trip(types_directory: Path):
+    assert TypeCatalog.get_names() == ["animal", "antenna", "apple"]
+    for name in TypeCatalog.get_names():
+        assert TypeCatalog.get(name).__dict__ == loads(types_directory.joinpath(f"{name}.json").read_text(
+            encoding="utf-8"))
+    with pytest.raises(Exception):
+        TypeCatalog.get("not a type")
+    # Read the header.
+    data = TypeCatalog.PATH.read_bytes()
+    length = unpack("<Q", data[:8])[0]
+    header = loads(data[8: 8 + length].decode("utf-8"))
+    assert [s[0] for s in header["sources"]] == ["animal.json", "antenna.json", "apple.json"]
+    assert list(header["types"].keys()) == ["animal", "antenna", "apple"]
+    offset, size = header["types"]["apple"]
+    blob = data[8 + length + offset: 8 + length + offset + size]
+    assert loads(blob.decode("utf-8"))["monster_type"] == "apple"
+    # Read the catalog file again without building it.
+    TypeCatalog.clear()
+    mtime = TypeCatalog.PATH.stat().st_mtime_ns
+    assert TypeCatalog.get("apple").monster_type == "apple"
+    assert TypeCatalog.PATH.stat().st_mtime_ns == mtime
+
+
+def test_stale(types_directory: Path):
+    assert TypeCatalog.get_names() == ["animal", "antenna", "apple"]
+    # Add a type.
+    td = loads(types_directory.joinpath("apple.json").read_text(encoding="utf-8"))
+    td["monster_type"] = "banana"
+    types_directory.joinpath("banana.json").write_text(dumps(td), encoding="utf-8")
+    TypeCatalog.clear()
+    assert TypeCatalog.get_names() == ["animal", "antenna", "apple", "banana"]
+    # Change a type.
+    td["nouns"] = ["plantain"]
+    types_directory.joinpath("banana.json").write_text(dumps(td, indent=2), encoding="utf-8")
+    TypeCatalog.clear()
+    assert TypeCatalog.get("banana").nouns == ["plantain"]
+    # Remove a type.
+    types_directory.joinpath("antenna.json").unlink()
+    TypeCatalog.clear()
+    assert TypeCatalog.get_names() == ["animal", "apple", "banana"]
+
+
+def test_invalid(types_directory: Path):
+    # An invalid catalog file is built again.
+    TypeCatalog.PATH.parent.mkdir(parents=True, exist_ok=True)
+    TypeCatalog.PATH.write_bytes(b"\xff" * 32)
+    assert TypeCatalog.get_names() == ["animal", "antenna", "apple"]
+    TypeCatalog.clear()
+    TypeCatalog.PATH.write_bytes(b"")
+    assert TypeCatalog.get("animal").monster_type == "animal"
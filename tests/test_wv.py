@@ -0,0 +1,151 @@
+from typing import Dict, List
+import numpy as np
+import pytest
+from procemon.paths import MOVES_DIRECTORY
+from procemon.wv import WV
+
+"""
+Compare the vectorized `WV` word lists to the original per-pair loops on a small, fixed set of word vectors.
+"""
+
+
+class Vectors:
+    """
+    A tiny word vector model with the parts of the gensim `KeyedVectors` API that `WV` uses.
+    """
+
+    def __init__(self, words: List[str], vector_size: int, seed: int):
+        rng = np.random.default_rng(seed)
+        self.vector_size: int = vector_size
+        self.words: List[str] = words
+        self.indices: Dict[str, int] = {w: i for i, w in enumerate(words)}
+        self.vectors: np.ndarray = rng.normal(size=(len(words), vector_size)).astype(np.float32)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.indices
+
+    def __getitem__(self, words):
+        if isinstance(words, str):
+            return self.vectors[self.indices[words]]
+        return np.stack([self.vectors[self.indices[w]] for w in words])
+
+    def distance(self, a: str, b: str) -> float:
+        va = self[a].astype(np.float64)
+        vb = self[b].astype(np.float64)
+        return 1 - float(np.dot(va, vb) / (np.linalg.norm(va) * np.linalg.norm(vb)))
+
+    def most_similar(self, word: str, topn: int) -> List[tuple]:
+        unit = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        similarities = unit.dot(unit[self.indices[word]])
+        return [(self.words[i], float(similarities[i])) for i in np.argsort(-similarities)
+                if self.words[i] != word][:topn]
+
+
+class FakeWV(WV):
+    """
+    A `WV` that uses a small `Vectors` model instead of loading a word vector file.
+    """
+
+    VECTORS: Vectors = None
+
+    def get_word_vector_model(self) -> Vectors:
+        return FakeWV.VECTORS
+
+
+def get_attack_verbs(wv: WV, distance: float) -> List[str]:
+    attack_verbs: List[str] = list()
+    for v in wv.verbs:
+        if len(v) <= 3:
+            continue
+        for av in WV.ATTACK_WORDS:
+            try:
+                if wv.wv.distance(v, av) < distance:
+                    attack_verbs.append(v)
+                    break
+            except KeyError:
+                break
+    return list(sorted(set(attack_verbs)))
+
+
+def get_type_verbs(wv: WV, monster_type: str) -> List[str]:
+    action_verb_distance = 0.4
+    max_distance = 0.6
+    type_verbs: List[str] = list()
+    while action_verb_distance < 1 and len(type_verbs) < WV.MIN_WORDS:
+        action_verbs = get_attack_verbs(wv=wv, distance=action_verb_distance)
+        for v in wv.verbs:
+            if len(v) <= 3 or v not in action_verbs or v in type_verbs:
+                continue
+            try:
+                if wv.wv.distance(v, monster_type) < max_distance:
+                    type_verbs.append(v)
+            except KeyError:
+                continue
+        action_verb_distance += 0.1
+    if len(type_verbs) < WV.MIN_WORDS:
+        action_verbs = get_attack_verbs(wv=wv, distance=0.6)
+        for ms in wv.wv.most_similar(monster_type, topn=WV.TOPN):
+            if len(type_verbs) >= WV.MIN_WORDS:
+                break
+            for v in wv.verbs:
+                if len(v) <= 3 or v not in action_verbs or v in type_verbs:
+                    continue
+                try:
+                    if wv.wv.distance(v, ms[0]) < max_distance:
+                        type_verbs.append(v)
+                except KeyError:
+                    continue
+    return list(sorted(set(type_verbs)))
+
+
+def get_type_adjectives(wv: WV, monster_type: str) -> List[str]:
+    max_distance = 0.6
+    type_adjectives: List[str] = list()
+    for a in wv.adjectives:
+        try:
+            if wv.wv.distance(a, monster_type) < max_distance:
+                type_adjectives.append(a)
+        except KeyError:
+            continue
+    if len(set(type_adjectives)) < WV.MIN_WORDS:
+        for ms in wv.wv.most_similar(monster_type, topn=WV.TOPN):
+            if len(set(type_adjectives)) >= WV.MIN_WORDS:
+                break
+            for a in wv.adjectives:
+                try:
+                    if wv.wv.distance(a, ms[0]) < max_distance:
+                        type_adjectives.append(a)
+                except KeyError:
+                    continue
+    return list(sorted(set(type_adjectives)))
+
+
+# The monster types. Each of these is in the word vector model.
+TYPES: List[str] = ["fire", "water", "ghost", "mineral", "plant", "bird"]
+
+
+@pytest.fixture(scope="module")
+def wv() -> WV:
+    # With this many dimensions, some types need the fallbacks in `get_type_verbs()` and `get_type_adjectives()` and some don't.
+    # A small vocabulary: some of the verbs and adjectives, the attack words, the monster types, and some other words.
+    verbs = MOVES_DIRECTORY.joinpath("verbs.txt").read_text(encoding="utf-8").split("\n")[:200]
+    adjectives = MOVES_DIRECTORY.joinpath("adjectives.txt").read_text(encoding="utf-8").split("\n")[:200]
+    others = [f"word{i}" for i in range(50)]
+    words = list(dict.fromkeys(verbs + adjectives + WV.ATTACK_WORDS + TYPES + others))
+    FakeWV.VECTORS = Vectors(words=words, vector_size=16, seed=0)
+    return FakeWV(quiet=True)
+
+
+@pytest.mark.parametrize("distance", [0.4, 0.5, 0.6, 0.8])
+def test_attack_verbs(wv: WV, distance: float):
+    assert wv.get_attack_verbs(distance=distance) == get_attack_verbs(wv=wv, distance=distance)
+
+
+@pytest.mark.parametrize("monster_type", TYPES)
+def test_type_verbs(wv: WV, monster_type: str):
+    assert wv.get_type_verbs(monster_type) == get_type_verbs(wv=wv, monster_type=monster_type)
+
+
+@pytest.mark.parametrize("monster_type", TYPES)
+def test_type_adjectives(wv: WV, monster_type: str):
+    assert wv.get_type_adjectives(monster_type) == get_type_adjectives(wv=wv, monster_type=monster_type)
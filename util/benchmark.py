@@ -0,0 +1,135 @@
+import os
+import random
+from time import time
+from hashlib import sha256
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from argparse import ArgumentParser
+from typing import Dict, Tuple
+import numpy as np
+from procemon import Dex
+from procemon.monster import Monster
+from procemon.card_back import CardBack
+from procemon.zine import Zine
+from procemon.http_session import HttpSession
+from procemon.http_cache import HttpCache
+from procemon.negative_cache import NegativeCache
+from procemon.sprite_cache import SpriteCache
+from procemon.markov_cache import MarkovCache
+from procemon.type_catalog import TypeCatalog
+from procemon.replay import Recording, ReplayServer
+
+"""
+Benchmark the `create_dex.py` pipeline without network access.
+
+First, record responses from Wikipedia and Wikimedia: `python3 benchmark.py --record`
+Then, replay them from a local stand-in server as many times as you want: `python3 benchmark.py --latency 0.05`
+
+Every run starts with empty caches in a temporary directory, so that every request is sent to the server.
+Given the same seed, the dex and the cards are the same every time. The digest at the end of each run can be compared between runs.
+"""
+
+
+def create_dex(directory: Path, seed: int, workers: int, num_types: int,
+               num_monsters_per_type: int) -> Tuple[Dict[str, float], str]:
+    """
+    Run the `create_dex.py` pipeline with empty caches.
+
+    :param directory: A temporary directory for the caches and the output files.
+    :param seed: The random seed.
+    :param workers: The number of processes that will render cards.
+    :param num_types: The number of monster types.
+    :param num_monsters_per_type: The number of monsters per type.
+
+    :return: Tuple: The time of each step in seconds, and a digest of the dex JSON file and the cards.
+    """
+
+    HttpCache.DIRECTORY = directory.joinpath("cache", "http")
+    HttpCache._SIZE = None
+    SpriteCache.PATH = directory.joinpath("cache", "sprites.bin")
+    SpriteCache.clear()
+    MarkovCache.DIRECTORY = directory.joinpath("cache", "markov")
+    MarkovCache.clear()
+    Dex.NO_IMAGES = NegativeCache(log_path=directory.joinpath("cache", "no_images.log"),
+                                  seed_path=Dex.NO_IMAGES.seed_path)
+    Monster.BAD_WIKIPEDIA_URLS = NegativeCache(log_path=directory.joinpath("cache", "bad_wikipedia_urls.log"),
+                                               seed_path=Monster.BAD_WIKIPEDIA_URLS.seed_path)
+    Monster.WIKIPEDIA.clear()
+    Dex.REGION_MODEL_PATH = directory.joinpath("cache", "region_model.json")
+    Dex._REGION_MODEL = None
+    TypeCatalog.PATH = directory.joinpath("cache", "type_catalog.bin")
+    TypeCatalog.clear()
+    random.seed(seed)
+    np.random.seed(seed)
+    # The dex is written to dst/ in the working directory.
+    cwd = os.getcwd()
+    os.chdir(str(directory.resolve()))
+    times: Dict[str, float] = dict()
+    try:
+        t0 = time()
+        d = Dex(num_types=num_types, num_monsters_per_type=num_monsters_per_type, quiet=True)
+        d.prefetch_images()
+        times["dex"] = time() - t0
+        t0 = time()
+        d.write_json()
+        times["json"] = time() - t0
+        t0 = time()
+        d.create_cards(quiet=True, workers=workers, seed=seed)
+        times["cards"] = time() - t0
+        t0 = time()
+        card_back = CardBack.get(region=d.region, symbol=d.region_symbol)
+        Zine.create(dex_path=d.dst, card_back=card_back, quiet=True)
+        times["zine"] = time() - t0
+        # The zine PDF has a timestamp, so it isn't part of the digest.
+        digest = sha256()
+        for f in sorted(d.dst.iterdir()):
+            if f.suffix in [".json", ".png"]:
+                digest.update(f.name.encode("utf-8"))
+                digest.update(f.read_bytes())
+    finally:
+        os.chdir(cwd)
+    return times, digest.hexdigest()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--record", action="store_true", help="Record responses from Wikipedia and Wikimedia.")
+    parser.add_argument("--recording", type=str, default=str(Path.home().joinpath("procemon_recording")),
+                        help="The directory of the recording.")
+    parser.add_argument("--latency", type=float, default=0, help="The latency of each response in seconds.")
+    parser.add_argument("--error_rate", type=float, default=0,
+                        help="The probability, between 0 and 1, that a response is an error.")
+    parser.add_argument("--seed", type=int, default=0, help="The random seed.")
+    parser.add_argument("--workers", type=int, default=1, help="The number of processes that will render cards.")
+    parser.add_argument("--num_types", type=int, default=12, help="The number of monster types.")
+    parser.add_argument("--num_monsters_per_type", type=int, default=9, help="The number of monsters per type.")
+    args = parser.parse_args()
+    recording = Recording(directory=Path(args.recording))
+    server = None
+    if args.record:
+        HttpSession.RECORDING = recording
+    else:
+        if len(recording) == 0:
+            raise Exception(f"There are no recorded responses in: {recording.directory}")
+        server = ReplayServer(recording=recording, latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+        server.start()
+        HttpSession.HOSTS = server.get_hosts()
+    try:
+        with TemporaryDirectory() as temp:
+            t0 = time()
+            step_times, dex_digest = create_dex(directory=Path(temp), seed=args.seed, workers=args.workers,
+                                                num_types=args.num_types,
+                                                num_monsters_per_type=args.num_monsters_per_type)
+            total_time = time() - t0
+    finally:
+        if server is not None:
+            server.stop()
+    for step in step_times:
+        print(f"{step}: {round(step_times[step], 3)}s")
+    print(f"Total: {round(total_time, 3)}s")
+    if args.record:
+        print(f"Recorded responses: {len(recording)}")
+    else:
+        print(f"Responses per status code: {dict(sorted(server.status_codes.items()))}")
+        print(f"Requests that weren't recorded: {len(server.missing)}")
+    print(f"Digest: {dex_digest}")
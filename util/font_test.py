@@ -10,7 +10,7 @@ This will print out any unsupported words.
 # Test the nouns.
 print("Type nouns:")
 for f in TYPES_DIRECTORY.iterdir():
-    if f.is_file():
+    if f.is_file() and f.suffix == ".json":
         d = loads(f.read_text(encoding="utf-8"))
         for n in d["nouns"]:
             if Dex.get_supported_string(n) != n:
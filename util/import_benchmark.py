@@ -0,0 +1,47 @@
+import sys
+from json import loads
+from statistics import median
+from subprocess import check_output
+from argparse import ArgumentParser
+
+"""
+Benchmark how long it takes to import procemon modules.
+
+Each import is timed in a new Python process, so nothing has been imported yet. The median time of several runs is printed, along with any heavy dependencies that the import loaded.
+Usage: `python3 import_benchmark.py --runs 10`
+"""
+
+# Import a module in a new process and print the time and the loaded heavy dependencies.
+SCRIPT = """
+import sys
+from json import dumps
+from time import perf_counter
+t0 = perf_counter()
+import {module}
+t = perf_counter() - t0
+heavy = ["numpy", "PIL", "requests", "markovify", "fontTools", "perlin_numpy", "pkg_resources", "multiprocessing", "fpdf"]
+print(dumps({{"time": t, "loaded": [h for h in heavy if h in sys.modules]}}))
+"""
+
+
+def time_import(module: str, runs: int) -> dict:
+    """
+    :param module: The name of the module, for example `"procemon.dex"`.
+    :param runs: The number of times to import the module.
+
+    :return: A dictionary: `{"time": the median time in seconds, "loaded": the heavy dependencies that were loaded}`.
+    """
+
+    results = [loads(check_output([sys.executable, "-c", SCRIPT.format(module=module)]).decode("utf-8"))
+               for _ in range(runs)]
+    return {"time": median([r["time"] for r in results]), "loaded": results[-1]["loaded"]}
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="The number of times to import each module.")
+    args = parser.parse_args()
+    for m in ["procemon", "procemon.dex_encoder", "procemon.card_back", "procemon.zine", "procemon.monster",
+              "procemon.dex"]:
+        r = time_import(module=m, runs=args.runs)
+        print(f"{m}: {round(r['time'] * 1000, 1)}ms {r['loaded']}")